@@ -0,0 +1,29 @@
+"""add keyset pagination indexes to listings
+
+Revision ID: add_listing_keyset_idx
+Revises: add_profile_image
+Create Date: 2025-11-20 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_listing_keyset_idx'
+down_revision: Union[str, None] = 'add_profile_image'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Índices para paginación keyset por (created_at, listing_id) DESC
+    op.create_index('ix_listings_status_created_id', 'listings', ['status', 'created_at', 'listing_id'], unique=False)
+    op.create_index('ix_listings_seller_created_id', 'listings', ['seller_id', 'created_at', 'listing_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_listings_seller_created_id', table_name='listings')
+    op.drop_index('ix_listings_status_created_id', table_name='listings')
@@ -0,0 +1,36 @@
+"""add full-text search column to listings
+
+Revision ID: add_listing_search_tsv
+Revises: add_listing_keyset_idx
+Create Date: 2025-11-21 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_listing_search_tsv'
+down_revision: Union[str, None] = 'add_listing_keyset_idx'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Columna tsvector generada a partir de título y descripción + índice GIN
+    op.add_column('listings', sa.Column(
+        'search_tsv',
+        postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))", persisted=True),
+        nullable=True,
+        comment='Vector de búsqueda generado a partir de título y descripción'
+    ))
+    op.create_index('ix_listings_search_tsv', 'listings', ['search_tsv'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_listings_search_tsv', table_name='listings', postgresql_using='gin')
+    op.drop_column('listings', 'search_tsv')
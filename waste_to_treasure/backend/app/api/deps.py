@@ -10,21 +10,78 @@ Incluye implementación de Just-In-Time (JIT) User Creation para AWS Cognito.
 
 import logging
 import uuid
-from typing import Optional
+from typing import Dict, Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import make_transient_to_detached
 
 from app.core.config import get_settings, Settings
 from app.core.database import get_async_session as get_async_db
-from app.core.security import verify_cognito_token
+from app.core.security import unauthorized, verify_cognito_token
 from app.models.user import User, UserRoleEnum, UserStatusEnum
+from app.utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 security = HTTPBearer()
 
+_ADMIN = UserRoleEnum.ADMIN
+
+# Snapshot de columnas de usuarios autenticados, indexado por el 'sub' de
+# Cognito tal cual llega en el token
+_user_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
+# 'sub' crudo de los tokens cuyo 'sub' no coincide con str(user_id)
+# (mayúsculas, sin guiones...), para poder invalidarlos a partir del UUID
+_user_cache_subs = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
+
+
+# Columnas que se leen en el lookup de autenticación (proyección, no entidad ORM)
+_USER_COLUMNS = tuple(attr.class_attribute for attr in User.__mapper__.column_attrs)
+
+
+def _snapshot_user(user: User) -> Dict:
+    """Copia los valores de columna del usuario para guardarlos en caché."""
+    return {attr.key: getattr(user, attr.key) for attr in User.__mapper__.column_attrs}
+
+
+async def _user_from_snapshot(db: AsyncSession, snapshot: Dict) -> User:
+    """
+    Reconstruye un `User` desde la caché y lo asocia a la sesión sin SQL.
+    
+    El objeto queda persistente en `db`, por lo que los endpoints pueden
+    modificarlo y hacer commit igual que si viniera de un SELECT.
+    """
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return await db.merge(user, load=False)
+
+
+def invalidate_cached_user(user_id: uuid.UUID) -> None:
+    """
+    Descarta el usuario de la caché de autenticación.
+    
+    Debe llamarse tras modificar un usuario (perfil, rol o estado) para que
+    el siguiente request no use datos obsoletos.
+    """
+    key = str(user_id)
+    _user_cache.pop(_user_cache_subs.pop(key, key))
+
+
+def _cache_user(sub: str, user_id: uuid.UUID, snapshot: Dict) -> None:
+    """Guarda el snapshot bajo el 'sub' crudo del token."""
+    _user_cache.set(sub, snapshot)
+    if sub != str(user_id):
+        _user_cache_subs.set(str(user_id), sub)
+
 
 async def get_current_user_with_jit(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -68,43 +125,47 @@ async def get_current_user_with_jit(
         - El UUID del usuario se toma del claim 'sub' del token Cognito
         - El email se toma del claim 'email' del token
         - Usuarios nuevos se crean con role=BUYER y status=ACTIVE
+        - Los usuarios se cachean `USER_CACHE_TTL_SECONDS`; los endpoints que
+          los modifican deben llamar a `invalidate_cached_user`
     """
     token = credentials.credentials
     
     # Verificar el token de Cognito
-    payload = verify_cognito_token(token)
+    payload = await verify_cognito_token(token)
     
     # Extraer datos del token
     user_id_str: str = payload.get("sub")
     email: str = payload.get("email")
     
     if not user_id_str:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token inválido: falta el claim 'sub' (user ID)",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise unauthorized("Token inválido: falta el claim 'sub' (user ID)")
     
     if not email:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token inválido: falta el claim 'email'",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise unauthorized("Token inválido: falta el claim 'email'")
     
-    # Convertir sub a UUID
-    try:
-        user_id = uuid.UUID(user_id_str)
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token inválido: 'sub' no es un UUID válido",
-            headers={"WWW-Authenticate": "Bearer"},
+    # Buscar usuario primero en caché (indexada por el 'sub' tal cual llega
+    # en el token) y, si no está, en la base de datos
+    snapshot = _user_cache.get(user_id_str)
+    if snapshot is not None:
+        user = await _user_from_snapshot(db, snapshot)
+    else:
+        # Convertir sub a UUID (solo en cache miss)
+        try:
+            user_id = uuid.UUID(user_id_str)
+        except ValueError:
+            raise unauthorized("Token inválido: 'sub' no es un UUID válido")
+        
+        # user_id es PK: basta con la primera fila, sin verificar unicidad
+        result = await db.execute(
+            select(*_USER_COLUMNS).where(User.user_id == user_id).limit(1)
         )
-    
-    # Buscar usuario en la base de datos
-    result = await db.execute(select(User).where(User.user_id == user_id))
-    user = result.scalar_one_or_none()
+        row = result.first()
+        if row is not None:
+            snapshot = row._asdict()
+            _cache_user(user_id_str, user_id, snapshot)
+            user = await _user_from_snapshot(db, snapshot)
+        else:
+            user = None
     
     # JIT: Si el usuario no existe, crearlo automáticamente
     if user is None:
@@ -134,6 +195,7 @@ async def get_current_user_with_jit(
             
             logger.info(f"Usuario creado exitosamente (JIT): {email}")
             user = new_user
+            _cache_user(user_id_str, user_id, _snapshot_user(user))
             
         except Exception as e:
             await db.rollback()
@@ -143,7 +205,27 @@ async def get_current_user_with_jit(
                 detail="Error creando usuario en la base de datos"
             )
     
-    # Verificar estado del usuario
+    _check_user(user)
+    
+    logger.debug("Usuario autenticado: %s (UUID: %s)", user.email, user.user_id)
+    return user
+
+
+def _check_user(user: User, *, require_role: Optional[UserRoleEnum] = None) -> User:
+    """
+    Valida el estado del usuario y, opcionalmente, su rol.
+    
+    Args:
+        user: Usuario autenticado.
+        require_role: Rol exigido; None si basta con estar activo.
+        
+    Returns:
+        El mismo usuario si pasa las validaciones.
+        
+    Raises:
+        HTTPException 403: Si el usuario está bloqueado, pendiente o no
+            tiene el rol requerido.
+    """
     if user.status == UserStatusEnum.BLOCKED:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -157,72 +239,57 @@ async def get_current_user_with_jit(
             detail="Usuario pendiente de activación."
         )
     
-    logger.debug(f"Usuario autenticado: {user.email} (UUID: {user.user_id})")
-    return user
-
-
-async def get_current_active_user(
-    current_user: User = Depends(get_current_user_with_jit)
-) -> User:
-    """
-    Dependencia que verifica que el usuario esté activo.
-    
-    Args:
-        current_user: Usuario autenticado obtenido de get_current_user_with_jit.
-        
-    Returns:
-        Usuario activo.
-        
-    Raises:
-        HTTPException 403: Si el usuario no está activo.
-        
-    Note:
-        Esta validación ya se hace en get_current_user_with_jit, por lo que esta
-        dependencia es principalmente para claridad semántica en el código.
-    """
-    if current_user.status != UserStatusEnum.ACTIVE:
+    if require_role is not None and user.role != require_role:
+        logger.warning(
+            "Usuario %s intentó acceder a endpoint que requiere rol %s",
+            user.user_id,
+            require_role.value
+        )
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="Usuario inactivo"
+            detail="Se requieren permisos de administrador para esta operación"
+            if require_role == UserRoleEnum.ADMIN
+            else f"Se requiere el rol {require_role.value} para esta operación"
         )
-    return current_user
+    
+    return user
 
 
-async def require_admin(
-    current_user: User = Depends(get_current_active_user)
-) -> User:
+def requires(role: Optional[UserRoleEnum] = None):
     """
-    Dependencia que requiere que el usuario tenga rol ADMIN.
+    Fábrica de dependencias de autorización.
+    
+    Genera una dependencia que autentica al usuario y valida su rol en un
+    solo paso, sin encadenar varias dependencias intermedias.
     
     Args:
-        current_user: Usuario autenticado y activo.
+        role: Rol requerido; None para exigir solo un usuario activo.
         
     Returns:
-        Usuario administrador.
-        
-    Raises:
-        HTTPException 403: Si el usuario no es administrador.
+        Dependencia de FastAPI que retorna el usuario autorizado.
         
     Example:
         ```python
+        require_admin = requires(UserRoleEnum.ADMIN)
+        
         @router.post("/categories", dependencies=[Depends(require_admin)])
-        async def create_category(
-            data: CategoryCreate,
-            db: AsyncSession = Depends(get_async_db)
-        ):
+        async def create_category(...):
             # Solo admins pueden ejecutar este endpoint
             ...
         ```
     """
-    if current_user.role != UserRoleEnum.ADMIN:
-        logger.warning(
-            f"Usuario {current_user.user_id} intentó acceder a endpoint de admin"
-        )
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Se requieren permisos de administrador para esta operación"
-        )
-    return current_user
+    async def dependency(user: User = Depends(get_current_user_with_jit)) -> User:
+        return _check_user(user, require_role=role)
+    
+    return dependency
+
+
+# get_current_user_with_jit ya rechaza usuarios bloqueados o pendientes,
+# por lo que "usuario activo" no necesita una dependencia adicional.
+get_current_active_user = get_current_user_with_jit
+
+# Requiere que el usuario tenga rol ADMIN (403 en caso contrario)
+require_admin = requires(UserRoleEnum.ADMIN)
 
 
 def verify_resource_owner(resource_owner_id: uuid.UUID, current_user: User) -> None:
@@ -253,20 +320,22 @@ def verify_resource_owner(resource_owner_id: uuid.UUID, current_user: User) -> N
             await db.commit()
         ```
     """
+    # Caso común: el usuario es el propietario del recurso
+    if current_user.user_id == resource_owner_id:
+        return
+    
     # Los administradores pueden acceder a cualquier recurso
-    if current_user.role == UserRoleEnum.ADMIN:
+    if current_user.role == _ADMIN:
         return
     
-    # El usuario debe ser el propietario
-    if current_user.user_id != resource_owner_id:
-        logger.warning(
-            f"Usuario {current_user.user_id} intentó acceder a recurso de "
-            f"usuario {resource_owner_id}"
-        )
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tiene permisos para acceder a este recurso"
-        )
+    logger.warning(
+        f"Usuario {current_user.user_id} intentó acceder a recurso de "
+        f"usuario {resource_owner_id}"
+    )
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="No tiene permisos para acceder a este recurso"
+    )
 
 
 # Alias para mantener compatibilidad con código existente
@@ -281,5 +350,7 @@ __all__ = [
     "get_current_user_with_jit",
     "get_current_active_user",
     "require_admin",
+    "requires",
     "verify_resource_owner",
+    "invalidate_cached_user",
 ]
@@ -19,7 +19,8 @@ from app.schemas.listing import (
     ListingRead,
     ListingCardRead,
     ListingListResponse,
-    ListingImageRead
+    ListingImageRead,
+    PresignedImageUpload
 )
 from app.services import listing_service
 from app.services.aws_s3_service import s3_service
@@ -116,7 +117,13 @@ async def list_public_listings(
         None, min_length=3, description="Buscar en título y descripción"
     ),
     page: int = Query(1, ge=1, description="Número de página"),
-    page_size: int = Query(20, ge=1, le=100, description="Elementos por página")
+    page_size: int = Query(20, ge=1, le=100, description="Elementos por página"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor de la página siguiente (`next_cursor`); si se envía, se ignora `page`"
+    ),
+    include_total: Optional[bool] = Query(
+        None, description="Calcular `total` (por defecto solo en paginación por página)"
+    )
 ) -> ListingListResponse:
     """
     Lista publicaciones activas con filtros y paginación.
@@ -135,13 +142,17 @@ async def list_public_listings(
     **Paginación**:
     - `page`: Número de página (default: 1)
     - `page_size`: Elementos por página (default: 20, max: 100)
+    - `cursor`: Paginación keyset para scroll infinito; usar el `next_cursor`
+      de la respuesta anterior
+    - `include_total`: Calcular `total` (default: solo sin `cursor`); el total
+      se cachea unos segundos
     """
     logger.info(
         f"Listando publicaciones: type={listing_type}, category={category_id}, "
         f"page={page}, page_size={page_size}"
     )
 
-    listings, total = await listing_service.get_public_listings(
+    listings, total, next_cursor = await listing_service.get_public_listings(
         db=db,
         listing_type=listing_type,
         category_id=category_id,
@@ -149,7 +160,9 @@ async def list_public_listings(
         max_price=max_price,
         search_query=search,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        cursor=cursor,
+        include_total=cursor is None if include_total is None else include_total
     )
 
     # Convertir a cards
@@ -162,7 +175,8 @@ async def list_public_listings(
         total=total,
         page=page,
         page_size=page_size,
-        items=items
+        items=items,
+        next_cursor=next_cursor
     )
 
 
@@ -183,7 +197,13 @@ async def list_my_listings(
         None, description="Filtrar por estado"
     ),
     page: int = Query(1, ge=1),
-    page_size: int = Query(20, ge=1, le=100)
+    page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        None, description="Cursor de la página siguiente (`next_cursor`); si se envía, se ignora `page`"
+    ),
+    include_total: Optional[bool] = Query(
+        None, description="Calcular `total` (por defecto solo en paginación por página)"
+    )
 ) -> ListingListResponse:
     """
     Lista las publicaciones del usuario autenticado.
@@ -201,12 +221,14 @@ async def list_my_listings(
         f"(status={status_filter}, page={page})"
     )
 
-    listings, total = await listing_service.get_seller_listings(
+    listings, total, next_cursor = await listing_service.get_seller_listings(
         db=db,
         seller_id=current_user.user_id,
         status_filter=status_filter,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        cursor=cursor,
+        include_total=cursor is None if include_total is None else include_total
     )
 
     # Convertir a cards
@@ -219,7 +241,8 @@ async def list_my_listings(
         total=total,
         page=page,
         page_size=page_size,
-        items=items
+        items=items,
+        next_cursor=next_cursor
     )
 
 
@@ -472,6 +495,98 @@ async def upload_listing_images(
     return images
 
 
+@router.post(
+    "/{listing_id}/images/upload",
+    response_model=List[ListingImageRead],
+    summary="Subir imágenes a publicación",
+    description="Sube varios archivos de imagen a S3 en paralelo y los agrega a la publicación. Requiere autenticación y ownership.",
+    responses={
+        200: {"description": "Imágenes subidas y agregadas exitosamente"},
+        400: {"description": "Archivo inválido o máximo de imágenes excedido"},
+        401: {"description": "No autenticado"},
+        403: {"description": "Sin permisos (no es el owner)"},
+        404: {"description": "Publicación no encontrada"},
+        500: {"description": "Error al subir imágenes"},
+    }
+)
+async def upload_listing_image_files(
+    listing_id: int,
+    files: List[UploadFile] = File(..., description="Archivos de imagen"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+) -> List[ListingImageRead]:
+    """
+    Sube imágenes a S3 y las agrega a una publicación en un solo paso.
+
+    **Requiere autenticación y ser el owner**
+
+    - Tipos permitidos: JPG, JPEG, PNG, WEBP
+    - Tamaño máximo: 5MB por imagen
+    - Máximo 10 imágenes por publicación
+    - Los archivos se suben a S3 de forma concurrente
+    """
+    logger.info(
+        f"Usuario {current_user.user_id} subiendo {len(files)} imágenes "
+        f"al listing {listing_id}"
+    )
+
+    images = await listing_service.upload_images_to_listing(
+        db=db,
+        listing_id=listing_id,
+        seller_id=current_user.user_id,
+        files=files
+    )
+
+    return images
+
+
+@router.post(
+    "/{listing_id}/images/presign",
+    response_model=List[PresignedImageUpload],
+    summary="Obtener uploads presignados para imágenes",
+    description="Genera formularios presignados para subir imágenes directamente a S3. Requiere autenticación y ownership.",
+    responses={
+        200: {"description": "Uploads presignados generados"},
+        400: {"description": "Tipo de archivo inválido o máximo de imágenes excedido"},
+        401: {"description": "No autenticado"},
+        403: {"description": "Sin permisos (no es el owner)"},
+        404: {"description": "Publicación no encontrada"},
+    }
+)
+async def presign_listing_images(
+    listing_id: int,
+    content_types: List[str] = Query(..., description="Tipo MIME de cada imagen a subir"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+) -> List[PresignedImageUpload]:
+    """
+    Genera uploads presignados para subir imágenes sin pasar por la API.
+
+    **Requiere autenticación y ser el owner**
+
+    **Flujo:**
+    1. Llamar este endpoint con el tipo MIME de cada imagen
+    2. Por cada elemento, enviar un POST multipart a `upload_url` con
+       `fields` y el archivo (campo `file` al final)
+    3. Registrar las `image_url` con `POST /{listing_id}/images`
+
+    S3 rechaza archivos de más de 5MB o con otro Content-Type.
+    """
+    logger.info(
+        f"Usuario {current_user.user_id} solicitando {len(content_types)} uploads "
+        f"presignados para listing {listing_id}"
+    )
+
+    uploads = await listing_service.presign_listing_image_uploads(
+        db=db,
+        listing_id=listing_id,
+        seller_id=current_user.user_id,
+        content_types=content_types
+    )
+
+    return uploads
+
+
 @router.post(
     "/upload-image",
     response_model=dict,
@@ -17,7 +17,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db, get_async_session
-from app.api.deps import get_current_active_user, require_admin
+from app.api.deps import get_current_active_user, require_admin, invalidate_cached_user
 from app.models.user import User
 from app.schemas.user import UserRead, UserUpdate, UserAdminUpdate, UserPublic
 from app.services.aws_s3_service import s3_service
@@ -139,6 +139,7 @@ async def update_current_user_profile(
     # Guardar cambios (NO necesitamos db.add - el objeto ya está en la sesión)
     await db.commit()
     await db.refresh(current_user)
+    invalidate_cached_user(current_user.user_id)
     
     return UserRead.model_validate(current_user)
 
@@ -398,5 +399,6 @@ async def update_user_by_admin(
     # NO necesitamos db.add - el objeto ya está en la sesión
     await db.commit()
     await db.refresh(user)
+    invalidate_cached_user(user.user_id)
     
     return UserRead.model_validate(user)
@@ -30,8 +30,15 @@ class Settings(BaseSettings):
     # ==================================
     DATABASE_URL: PostgresDsn
     DB_ECHO: bool = False
-    DB_POOL_SIZE: int = 10
-    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_TIMEOUT: int = 30
+    # Activar si DATABASE_URL apunta a PgBouncer en modo transaction pooling
+    DB_USE_PGBOUNCER: bool = False
+    # Falla con error ante lazy loads no previstos (N+1) en consultas con raiseload
+    DB_RAISELOAD: bool = False
+    # Entradas de la caché de SQL compilado de SQLAlchemy por engine (default 500)
+    DB_QUERY_CACHE_SIZE: int = 1200
     
     @field_validator("DATABASE_URL", mode="before")
     @classmethod
@@ -62,7 +69,16 @@ class Settings(BaseSettings):
     COGNITO_USER_POOL_ID: str = ""
     COGNITO_APP_CLIENT_ID: str = ""
     COGNITO_REGION: str = "us-east-2"
-    
+    # Caché de payloads JWT ya verificados (evita repetir la verificación RS256)
+    JWT_CACHE_TTL_SECONDS: int = 10
+    JWT_CACHE_MAX_SIZE: int = 10000
+    # JWKS de Cognito: TTL de la caché y semilla opcional en disco
+    COGNITO_JWKS_TTL_SECONDS: int = 3600
+    COGNITO_JWKS_SEED_PATH: str = ""
+    # Caché de usuarios autenticados (evita una consulta a BD por request)
+    USER_CACHE_TTL_SECONDS: int = 30
+    USER_CACHE_MAX_SIZE: int = 5000
+
     @property
     def cognito_issuer(self) -> str:
         """Retorna el issuer URL del User Pool de Cognito."""
@@ -125,6 +141,8 @@ class Settings(BaseSettings):
     # LÓGICA DE NEGOCIO
     # ==================================
     COMMISSION_RATE: float = 0.10
+    # Caché de totales de listados paginados (evita un COUNT por request)
+    LISTING_TOTAL_CACHE_TTL_SECONDS: int = 30
     
     # ==================================
     # CORS
@@ -151,6 +169,10 @@ class Settings(BaseSettings):
     # ==================================
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    # Profiling con pyinstrument (?profile=1); requiere `pip install pyinstrument`
+    PROFILING_ENABLED: bool = False
+    # Intervalo para loguear el estado del pool de conexiones (0 = deshabilitado)
+    DB_POOL_LOG_INTERVAL_SECONDS: int = 0
     
     def setup_logging(self) -> None:
         """Configura el sistema de logging de la aplicación."""
@@ -2,12 +2,13 @@
 Configuración de la base de datos usando SQLAlchemy 2.0.
 Proporciona el engine, sessionmaker y base declarativa para los modelos.
 """
+import asyncio
 import logging
 from typing import Generator, AsyncGenerator
 from sqlalchemy import create_engine, event, text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, Session, DeclarativeBase
-from sqlalchemy.pool import QueuePool, NullPool
+from sqlalchemy.pool import QueuePool
 from app.core.config import get_settings
 
 # Configurar logger
@@ -38,8 +39,10 @@ def create_db_engine():
             poolclass=QueuePool,
             pool_size=settings.DB_POOL_SIZE,
             max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
             pool_pre_ping=True,
             pool_recycle=3600, # Recicla conexiones cada hora
+            query_cache_size=settings.DB_QUERY_CACHE_SIZE,
         )
         logger.info("Engine de base de datos creado exitosamente.")
         return engine
@@ -78,13 +81,24 @@ elif async_database_url.startswith("postgresql://"):
 
 logger.info(f"Usando URL async: {async_database_url.split('@')[0]}@***")
 
-# IMPORTANTE: AsyncEngine NO puede usar QueuePool
-# Usar NullPool para async o dejar que SQLAlchemy use el pool por defecto para async
+# PgBouncer en modo transaction pooling no soporta prepared statements
+# persistentes: se desactivan las cachés de statements de asyncpg.
+async_connect_args = {}
+if settings.DB_USE_PGBOUNCER:
+    async_connect_args = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+
+# El AsyncEngine usa por defecto AsyncAdaptedQueuePool: las conexiones se
+# reutilizan entre requests en lugar de abrir una nueva (TCP + auth) cada vez.
 async_engine = create_async_engine(
     async_database_url,
     echo=settings.DB_ECHO,
-    poolclass=NullPool,  # NullPool es compatible con async
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
     pool_pre_ping=True,
+    pool_recycle=3600, # Recicla conexiones cada hora
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+    connect_args=async_connect_args,
 )
 logger.info("Async engine de base de datos creado exitosamente.")
 
@@ -177,6 +191,32 @@ async def check_db_connection_async() -> bool:
         logger.error(f"Error conectando a la base de datos de forma asíncrona: {e}")
         return False
 
+def get_pool_status() -> dict:
+    """
+    Retorna el estado de los pools de conexiones (sync y async).
+    
+    Útil para detectar agotamiento del pool ("QueuePool limit ... reached").
+    """
+    return {
+        name: {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        }
+        for name, pool in (("sync", engine.pool), ("async", async_engine.pool))
+    }
+
+async def log_pool_status_periodically(interval: float) -> None:
+    """
+    Tarea de fondo que loguea el estado de los pools cada `interval` segundos.
+    
+    Permite detectar agotamiento del pool antes de que aparezcan timeouts.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        logger.info("Estado de pools de BD: %s", get_pool_status())
+
 def init_db() -> None:
     """
     Inicializa la base de datos creando todas las tablas.
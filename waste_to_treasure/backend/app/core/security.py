@@ -4,24 +4,239 @@ Módulo de seguridad y autenticación con AWS Cognito.
 Proporciona funciones para validar tokens JWT de Cognito,
 verificación de roles y autorización de recursos.
 """
+import asyncio
+import base64
+import hashlib
+import json
 import logging
-from typing import Dict
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
 
 import jwt
-from jwt import PyJWKClient
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from fastapi import HTTPException, status
 from fastapi.security import HTTPBearer
 
 from app.core.config import get_settings
+from app.utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 # Esquema de seguridad HTTP Bearer
 security = HTTPBearer()
+_BEARER_HEADERS = {"WWW-Authenticate": "Bearer"}
 
+# Valores de Cognito fijos durante la vida del proceso
+_EXPECTED_ISSUER = settings.cognito_issuer
+_JWKS_URL = f"{_EXPECTED_ISSUER}/.well-known/jwks.json"
+_AUDIENCE = settings.COGNITO_APP_CLIENT_ID
 
-def verify_cognito_token(token: str) -> Dict:
+# Payloads ya verificados, indexados por hash del token (nunca el token crudo)
+_verify_cache = TTLCache(
+    maxsize=settings.JWT_CACHE_MAX_SIZE,
+    ttl=settings.JWT_CACHE_TTL_SECONDS,
+)
+
+
+def unauthorized(detail: str) -> HTTPException:
+    """Construye la respuesta 401 estándar para fallos de autenticación Bearer."""
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers=_BEARER_HEADERS,
+    )
+
+
+def _token_cache_key(token: str) -> bytes:
+    """Retorna un hash corto del token para usarlo como clave de caché."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+# ==========================================
+# CACHÉ DE JWKS DE COGNITO
+# ==========================================
+# Se reemplaza completo en cada refresh (swap atómico), por lo que los
+# lectores nunca ven un estado a medias.
+_jwks_cache: Dict = {"keys": None, "by_kid": {}, "expires_at": 0.0}
+_jwks_lock = threading.Lock()
+
+# Sesión HTTP reutilizable: los refresh de JWKS reaprovechan la conexión TLS
+_jwks_session = requests.Session()
+_jwks_session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=2,
+        pool_maxsize=4,
+        max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+    ),
+)
+
+
+def _store_jwks(jwks: Dict) -> None:
+    """
+    Indexa las claves por 'kid' y publica el nuevo JWKS en la caché.
+    
+    Las claves públicas se construyen aquí una sola vez por refresh, así
+    cada verificación solo paga la comprobación de la firma.
+    """
+    global _jwks_cache
+    by_kid = {}
+    for key in jwks.get("keys", []):
+        try:
+            by_kid[key["kid"]] = jwt.PyJWK(key, algorithm="RS256")
+        except (jwt.PyJWKError, KeyError) as e:
+            logger.warning(f"Se ignora una JWK inválida en el JWKS de Cognito: {e}")
+    _jwks_cache = {
+        "keys": jwks.get("keys", []),
+        "by_kid": by_kid,
+        "expires_at": time.time() + settings.COGNITO_JWKS_TTL_SECONDS,
+    }
+
+
+def _seed_jwks_from_disk() -> None:
+    """Precarga el JWKS desde `COGNITO_JWKS_SEED_PATH` si está configurado."""
+    seed_path = settings.COGNITO_JWKS_SEED_PATH
+    if not seed_path or not Path(seed_path).is_file():
+        return
+    try:
+        _store_jwks(json.loads(Path(seed_path).read_text()))
+        logger.info(f"JWKS de Cognito precargadas desde {seed_path}")
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"No se pudo precargar JWKS desde {seed_path}: {e}")
+
+
+_seed_jwks_from_disk()
+
+
+def get_cognito_jwks(force_refresh: bool = False) -> Dict:
+    """
+    Retorna el JWKS de Cognito, descargándolo solo si la caché expiró.
+    
+    Args:
+        force_refresh: Si True, descarga el JWKS aunque la caché siga vigente
+            (p. ej. al encontrar un 'kid' desconocido tras una rotación).
+            
+    Returns:
+        Diccionario con 'keys', 'by_kid' (objetos `jwt.PyJWK` indexados
+        por 'kid') y 'expires_at'.
+        
+    Note:
+        Si la descarga falla pero hay claves previas, se siguen usando
+        las claves anteriores en lugar de rechazar todos los tokens.
+    """
+    cache = _jwks_cache
+    if not force_refresh and cache["keys"] is not None and cache["expires_at"] > time.time():
+        return cache
+
+    with _jwks_lock:
+        # Otro thread pudo haber refrescado mientras esperábamos el lock
+        cache = _jwks_cache
+        if not force_refresh and cache["keys"] is not None and cache["expires_at"] > time.time():
+            return cache
+        try:
+            response = _jwks_session.get(_JWKS_URL, timeout=(3, 10))
+            response.raise_for_status()
+            _store_jwks(orjson.loads(response.content))
+            logger.info("JWKS de Cognito obtenidas correctamente")
+        except (requests.RequestException, ValueError, KeyError) as e:
+            if cache["keys"] is None:
+                raise
+            logger.warning(f"Error refrescando JWKS, se usan las claves previas: {e}")
+        return _jwks_cache
+
+
+async def refresh_jwks_periodically() -> None:
+    """
+    Tarea de fondo que mantiene caliente la caché de JWKS.
+    
+    Se lanza en el startup de la aplicación: descarga el JWKS de inmediato
+    y luego lo refresca antes de que expire, para que la verificación de
+    tokens nunca espere una petición HTTPS.
+    """
+    interval = max(settings.COGNITO_JWKS_TTL_SECONDS / 2, 60)
+    while True:
+        try:
+            await asyncio.to_thread(get_cognito_jwks, True)
+        except Exception as e:
+            logger.warning(f"No se pudieron refrescar las JWKS de Cognito: {e}")
+        await asyncio.sleep(interval)
+
+
+def _get_signing_key(kid: Optional[str]) -> jwt.PyJWK:
+    """
+    Busca la clave pública ya construida correspondiente al 'kid' del token.
+    
+    Si el 'kid' no está en caché se fuerza un refresh (rotación de claves).
+    
+    Raises:
+        jwt.InvalidTokenError: Si el 'kid' no existe en el JWKS de Cognito.
+    """
+    signing_key = get_cognito_jwks()["by_kid"].get(kid)
+    if signing_key is None:
+        signing_key = get_cognito_jwks(force_refresh=True)["by_kid"].get(kid)
+    if signing_key is None:
+        raise jwt.InvalidTokenError(f"No se encontró la clave pública para kid={kid}")
+    return signing_key
+
+
+def _peek_kid(token: str) -> Optional[str]:
+    """
+    Extrae el 'kid' del header del JWT sin validar el token.
+    
+    Solo decodifica el segmento del header (base64url + JSON); la
+    validación completa la hace `jwt.decode` después.
+    
+    Raises:
+        jwt.InvalidTokenError: Si el header no es decodificable.
+    """
+    header_b64 = token.split(".", 1)[0]
+    padding = "=" * (-len(header_b64) % 4)
+    try:
+        header = json.loads(base64.urlsafe_b64decode(header_b64 + padding))
+        return header.get("kid")
+    except (ValueError, AttributeError) as e:
+        raise jwt.InvalidTokenError(f"Header del token inválido: {e}")
+
+
+def _verify_token_sync(token: str) -> Dict:
+    """
+    Parte CPU-bound de la verificación: busca la clave y valida la firma RS256.
+    
+    Se ejecuta en el thread pool para no bloquear el event loop.
+    
+    Raises:
+        jwt.InvalidTokenError: Si el token no es válido (incluye la falta
+            del claim 'exp', que es obligatorio).
+    """
+    # Obtener la clave de firma del token desde la caché de JWKS
+    kid = _peek_kid(token)
+    signing_key = _get_signing_key(kid)
+    
+    # Decodificar y validar el token
+    return jwt.decode(
+        token,
+        signing_key.key,
+        algorithms=["RS256"],
+        issuer=_EXPECTED_ISSUER,
+        audience=_AUDIENCE,
+        options={
+            "verify_signature": True,
+            "verify_exp": True,
+            "verify_iss": True,
+            "verify_aud": True,
+            # La caché de payloads expira con el 'exp' del token
+            "require": ["exp"],
+        }
+    )
+
+
+async def verify_cognito_token(token: str) -> Dict:
     """
     Verifica y decodifica un token JWT de AWS Cognito.
     
@@ -47,63 +262,42 @@ def verify_cognito_token(token: str) -> Dict:
         
     Example:
         ```python
-        payload = verify_cognito_token(token)
+        payload = await verify_cognito_token(token)
         user_id = UUID(payload["sub"])
         email = payload["email"]
         ```
+        
+    Note:
+        Los payloads válidos se cachean durante `JWT_CACHE_TTL_SECONDS`
+        (nunca más allá de su 'exp'), por lo que un mismo token repetido
+        no vuelve a pagar la verificación de firma. En un cache miss la
+        verificación RSA corre en el thread pool (`asyncio.to_thread`).
     """
-    # Construir JWKS URL
-    jwks_url = settings.cognito_jwks_url
-    
+    cache_key = _token_cache_key(token)
+    cached = _verify_cache.get(cache_key)
+    if cached is not None and cached["exp"] > time.time():
+        return cached
+
     try:
-        # Usar PyJWKClient para obtener y cachear las claves públicas
-        jwks_client = PyJWKClient(jwks_url)
-        
-        # Obtener la clave de firma del token
-        signing_key = jwks_client.get_signing_key_from_jwt(token)
-        
-        # Validar issuer esperado
-        expected_issuer = settings.cognito_issuer
+        payload = await asyncio.to_thread(_verify_token_sync, token)
         
-        # Decodificar y validar el token
-        payload = jwt.decode(
-            token,
-            signing_key.key,
-            algorithms=["RS256"],
-            issuer=expected_issuer,
-            audience=settings.COGNITO_APP_CLIENT_ID,
-            options={
-                "verify_signature": True,
-                "verify_exp": True,
-                "verify_iss": True,
-                "verify_aud": True,
-            }
-        )
+        _verify_cache.set(cache_key, payload, expires_at=payload["exp"])
         
-        logger.info(f"Token Cognito validado para usuario: {payload.get('sub')}")
+        logger.debug("Token Cognito validado para usuario: %s", payload.get("sub"))
         return payload
         
     except jwt.ExpiredSignatureError:
         logger.warning("Token expirado")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token expirado",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise unauthorized("Token expirado")
+    except jwt.MissingRequiredClaimError as e:
+        logger.warning(f"Token sin claim requerido: {e.claim}")
+        raise unauthorized(f"Token sin claim requerido: {e.claim}")
     except jwt.InvalidTokenError as e:
         logger.warning(f"Token inválido: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token inválido o mal formado",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise unauthorized("Token inválido o mal formado")
     except Exception as e:
         logger.error(f"Error inesperado validando token: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Error validando token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise unauthorized("Error validando token")
 
 
 # ==========================================
@@ -4,6 +4,7 @@ Waste-To-Treasure API - Aplicación principal FastAPI.
 Este módulo inicializa la aplicación FastAPI, configura middleware,
 maneja eventos del ciclo de vida y registra los routers principales.
 """
+import asyncio
 import logging
 import time
 from contextlib import asynccontextmanager
@@ -13,13 +14,18 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from app.api.v1.router import router as api_router_v1
 from app.core.config import get_settings
-from app.core.database import check_db_connection_async
+from app.core.database import (
+    check_db_connection_async,
+    get_pool_status,
+    log_pool_status_periodically,
+)
+from app.core.security import refresh_jwks_periodically
 
 # 1. Cargar configuración e inicializar logging
 # ==============================================
@@ -43,9 +49,21 @@ async def lifespan(app: FastAPI):
     else:
         logger.error("Error al conectar con la base de datos al inicio.")
     
+    # Mantener caliente la caché de JWKS de Cognito en segundo plano
+    jwks_refresh_task = asyncio.create_task(refresh_jwks_periodically())
+    
+    pool_log_task = None
+    if settings.DB_POOL_LOG_INTERVAL_SECONDS > 0:
+        pool_log_task = asyncio.create_task(
+            log_pool_status_periodically(settings.DB_POOL_LOG_INTERVAL_SECONDS)
+        )
+    
     yield
     
     # --- Shutdown ---
+    jwks_refresh_task.cancel()
+    if pool_log_task is not None:
+        pool_log_task.cancel()
     logger.info(f"Apagando {settings.PROJECT_NAME}")
 
 
@@ -57,6 +75,7 @@ app = FastAPI(
     description=settings.DESCRIPTION,
     debug=settings.DEBUG,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url=f"{settings.API_V1_STR}/docs",
     redoc_url=f"{settings.API_V1_STR}/redoc",
@@ -168,6 +187,34 @@ async def log_requests(request: Request, call_next):
     return response
 
 
+# Middleware de profiling (solo si PROFILING_ENABLED)
+# Cada request se perfila y el reporte de texto va al log; la respuesta es
+# la original. Con ?profile=1 se devuelve en su lugar el reporte HTML (el
+# status real queda en el header X-Profiled-Status)
+if settings.PROFILING_ENABLED:
+    from pyinstrument import Profiler
+
+    @app.middleware("http")
+    async def profile_request(request: Request, call_next):
+        profiler = Profiler(async_mode="enabled")
+        profiler.start()
+        response = await call_next(request)
+        profiler.stop()
+        if request.query_params.get("profile") == "1":
+            return HTMLResponse(
+                profiler.output_html(),
+                headers={"X-Profiled-Status": str(response.status_code)},
+            )
+        logger.info(
+            "Perfil de %s %s (%s):\n%s",
+            request.method, request.url.path, response.status_code,
+            profiler.output_text(),
+        )
+        return response
+
+    logger.info("Middleware de profiling (pyinstrument) habilitado.")
+
+
 # 5. Manejadores de Excepciones
 # ===============================
 
@@ -217,3 +264,9 @@ async def read_root():
 async def health_check():
     """Endpoint de health check detallado."""
     return {"status": "healthy"}
+
+if settings.DEBUG:
+    @app.get("/debug/pool", tags=["Health Check"])
+    async def debug_pool():
+        """Estado de los pools de conexiones a la BD (solo con DEBUG)."""
+        return get_pool_status()
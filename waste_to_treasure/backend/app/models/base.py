@@ -7,7 +7,7 @@ funcionalidad comun a todo los modelos de la abse de datos.
 from datetime import datetime, timezone
 from typing import Any
 
-from sqlalchemy import DateTime, func
+from sqlalchemy import Column, DateTime, func, inspect
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
@@ -62,9 +62,13 @@ class BaseModel(Base, TimestampMixin):
             >>> category.to_dict()
             {'category_id': 1, 'name': 'Wood', 'slug': 'wood', ...}
         """
+        # Columnas mapeadas (no las de la tabla): las columnas solo de tabla,
+        # como Listing.search_tsv, no existen como atributo. Se omiten las
+        # expresiones calculadas (query_expression), que no son columnas
         return {
-            column.name: getattr(self, column.name)
-            for column in self.__table__.columns
+            attr.key: getattr(self, attr.key)
+            for attr in inspect(self).mapper.column_attrs
+            if isinstance(attr.expression, Column)
         }
 
     def __repr__(self) -> str:
@@ -8,9 +8,9 @@ import uuid
 from typing import Optional, List, TYPE_CHECKING
 from decimal import Decimal
 
-from sqlalchemy import String, Integer, Text, Numeric, ForeignKey, Enum as SQLEnum, Index
-from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import String, Integer, Text, Numeric, ForeignKey, Enum as SQLEnum, Index, Computed, Column
+from sqlalchemy.orm import Mapped, mapped_column, relationship, query_expression
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
 import enum
 
 from app.models.base import BaseModel
@@ -78,6 +78,7 @@ class Listing(BaseModel):
         - category_id debe existir en categories.
         - location_address_id debe existir en addresses.
         - Índices en seller_id, status, listing_type para queries eficientes.
+        - Índice GIN en search_tsv para la búsqueda de texto completo.
     """
     __tablename__ = "listings"
 
@@ -177,6 +178,10 @@ class Listing(BaseModel):
         comment="Razón por la cual la publicación fue rechazada (proporcionada por admin)"
     )
 
+    # Expresión calculada bajo demanda: los listados la cargan con
+    # with_expression() en lugar de traer toda la colección de imágenes
+    primary_image_url: Mapped[Optional[str]] = query_expression()
+
     # RELACIONES
     seller: Mapped["User"] = relationship(
         "User",
@@ -226,7 +231,30 @@ class Listing(BaseModel):
         Index("ix_listings_seller_status", "seller_id", "status"),
         Index("ix_listings_category_status", "category_id", "status"),
         Index("ix_listings_price", "price"),
+        # Paginación keyset por (created_at, listing_id) DESC; PostgreSQL
+        # recorre estos índices en orden inverso sin costo adicional
+        Index("ix_listings_status_created_id", "status", "created_at", "listing_id"),
+        Index("ix_listings_seller_created_id", "seller_id", "created_at", "listing_id"),
+        # Columna generada para búsqueda de texto completo (índice GIN).
+        # Solo existe en la tabla, no en el mapper: se usa en filtros
+        # (`Listing.__table__.c.search_tsv`) y así nunca entra en el
+        # RETURNING de eager_defaults ni se carga en las entidades
+        Column(
+            "search_tsv",
+            TSVECTOR,
+            Computed(
+                "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))",
+                persisted=True
+            ),
+            comment="Vector de búsqueda generado a partir de título y descripción"
+        ),
+        Index("ix_listings_search_tsv", "search_tsv", postgresql_using="gin"),
     )
+
+    # created_at/updated_at se generan en el servidor: con eager_defaults se
+    # leen con RETURNING en el mismo INSERT/UPDATE, sin necesidad de un
+    # refresh posterior
+    __mapper_args__ = {"eager_defaults": True, "exclude_properties": ["search_tsv"]}
     
     # MÉTODOS DE INSTANCIA
     def is_available(self) -> bool:
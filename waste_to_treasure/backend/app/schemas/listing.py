@@ -3,7 +3,7 @@ Schemas Pydantic para Listing.
 
 Define los modelos de validación para requests y responses de la API.
 """
-from typing import Optional, List
+from typing import Dict, Optional, List
 from decimal import Decimal
 from datetime import datetime
 from uuid import UUID
@@ -160,10 +160,15 @@ class ListingCardRead(BaseModel):
 class ListingListResponse(BaseModel):
     """Schema para listado paginado."""
     
-    total: int = Field(..., description="Total de resultados")
+    total: Optional[int] = Field(
+        None, description="Total de resultados (None en paginación por cursor)"
+    )
     page: int = Field(..., description="Página actual")
     page_size: int = Field(..., description="Tamaño de página")
     items: List[ListingCardRead] = Field(..., description="Lista de publicaciones")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor para pedir la página siguiente (None si no hay más)"
+    )
 
 
 # SCHEMAS PARA UPLOAD DE IMÁGENES
@@ -180,6 +185,14 @@ class BulkImageUploadResponse(BaseModel):
     primary_image_url: str
 
 
+class PresignedImageUpload(BaseModel):
+    """Schema con los datos para subir una imagen directamente a S3."""
+    upload_url: str = Field(..., description="URL de S3 a la que enviar el POST")
+    fields: Dict[str, str] = Field(..., description="Campos del formulario a enviar junto al archivo")
+    s3_key: str = Field(..., description="Key del objeto en S3")
+    image_url: str = Field(..., description="URL pública que tendrá la imagen tras subirla")
+
+
 # SCHEMAS PARA FILTROS
 class ListingFilters(BaseModel):
     """Schema para filtros de búsqueda."""
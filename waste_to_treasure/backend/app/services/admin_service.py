@@ -20,6 +20,7 @@ from app.schemas.admin import (
     ListingModerationAction,
     ReportResolution
 )
+from app.services.listing_service import invalidate_listing_totals
 
 
 class AdminService:
@@ -452,6 +453,7 @@ class AdminService:
         db.add(action_log)
         
         await db.commit()
+        invalidate_listing_totals()
         await db.refresh(listing)
         await db.refresh(action_log)
         
@@ -509,6 +511,7 @@ class AdminService:
         db.add(action_log)
         
         await db.commit()
+        invalidate_listing_totals()
         await db.refresh(listing)
         await db.refresh(action_log)
         
@@ -2,8 +2,8 @@
 Servicio para gestionar uploads de imágenes en Amazon S3.
 
 Este servicio maneja:
-- Upload de imágenes de listings
-- Generación de URLs presignadas para acceso temporal
+- Upload de imágenes de listings (individual o en lote concurrente)
+- Generación de URLs presignadas para acceso temporal y upload directo
 - Eliminación de imágenes
 - Validación de tipos de archivo y tamaños
 
@@ -16,12 +16,16 @@ CONFIGURACIÓN REQUERIDA:
 IMPORTANTE: Este código NO se ejecutará hasta que configures las credenciales AWS.
 """
 
+import asyncio
 import logging
 import uuid
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from io import BytesIO
 
 import boto3
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError, BotoCoreError
 from fastapi import UploadFile, HTTPException, status
 
@@ -30,6 +34,30 @@ from app.core.config import get_settings
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Firmas (magic bytes) de los formatos de imagen permitidos
+_IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+)
+
+
+def _detect_image_type(header: bytes) -> Optional[str]:
+    """
+    Detecta el tipo MIME real de una imagen a partir de sus primeros bytes.
+    
+    Args:
+        header: Primeros bytes del archivo (bastan 12).
+        
+    Returns:
+        'image/jpeg', 'image/png' o 'image/webp', o None si no es ninguno.
+    """
+    for signature, mime_type in _IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return mime_type
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
 
 class S3Service:
     """
@@ -59,12 +87,17 @@ class S3Service:
     def __init__(self):
         """
         Inicializa el cliente S3.
+        
+        Se crea una sola vez por proceso (ver `s3_service` al final del
+        módulo); el cliente de boto3 es thread-safe y su pool de conexiones
+        se comparte entre todos los uploads concurrentes.
         """
         self.s3_client = boto3.client(
             's3',
             aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
             aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION
+            region_name=settings.AWS_REGION,
+            config=Config(max_pool_connections=50)
         )
         self.bucket_name = settings.S3_BUCKET_NAME
         self.images_prefix = settings.S3_IMAGES_PREFIX
@@ -80,8 +113,80 @@ class S3Service:
         # Tamaño máximo: 5MB
         self.max_file_size = 5 * 1024 * 1024
         
+        # Uploads simultáneos máximos por lote
+        self.max_concurrent_uploads = 8
+        
+        # Uploads grandes en multipart (partes de 16MB en paralelo); los
+        # archivos por debajo del umbral se suben con un solo PUT
+        self.transfer_config = TransferConfig(
+            multipart_threshold=8 * 1024 * 1024,
+            multipart_chunksize=16 * 1024 * 1024,
+            max_concurrency=10,
+            use_threads=True
+        )
+        
         logger.info(f"S3Service inicializado - Bucket: {self.bucket_name}")
     
+    async def _upload_bytes(
+        self,
+        contents: bytes,
+        s3_key: str,
+        content_type: str,
+        metadata: Dict[str, str]
+    ) -> None:
+        """
+        Sube bytes a S3 con `upload_fileobj` y la `transfer_config` del servicio.
+        
+        boto3 es bloqueante, por lo que el upload corre en el thread pool.
+        
+        Raises:
+            ClientError, BotoCoreError, S3UploadFailedError: Si falla el upload.
+        """
+        await asyncio.to_thread(
+            self.s3_client.upload_fileobj,
+            BytesIO(contents),
+            self.bucket_name,
+            s3_key,
+            ExtraArgs={
+                'ContentType': content_type,
+                'CacheControl': 'max-age=31536000',  # 1 año
+                'Metadata': metadata,
+            },
+            Config=self.transfer_config
+        )
+    
+    async def _validate_image_file(self, file: UploadFile) -> str:
+        """
+        Valida que el archivo sea realmente una imagen permitida.
+        
+        Además del `content_type` declarado por el cliente (falsificable),
+        revisa los magic bytes de la cabecera, así los archivos inválidos
+        se rechazan antes de leerlos completos o enviarlos a S3.
+        
+        Returns:
+            Tipo MIME detectado a partir del contenido.
+            
+        Raises:
+            HTTPException 400: Si el tipo declarado o el contenido no es
+                una imagen permitida.
+        """
+        if file.content_type not in self.allowed_types:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Tipo de archivo no permitido. Usa: {', '.join(self.allowed_types)}"
+            )
+        
+        header = await file.read(32)
+        await file.seek(0)
+        
+        content_type = _detect_image_type(header)
+        if content_type is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="El contenido del archivo no es una imagen JPEG, PNG o WEBP válida"
+            )
+        return content_type
+    
     async def upload_listing_image(
         self,
         file: UploadFile,
@@ -113,13 +218,35 @@ class S3Service:
             # file_url = "https://s3.amazonaws.com/bucket/images/listings/456/uuid.jpg"
             ```
         """
-        # Validar tipo de archivo
-        if file.content_type not in self.allowed_types:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Tipo de archivo no permitido. Usa: {', '.join(self.allowed_types)}"
-            )
+        # Validar tipo de archivo (declarado y por contenido)
+        content_type = await self._validate_image_file(file)
+        
+        _, file_url = await self._upload_listing_file(file, listing_id, content_type, is_primary)
+        return file_url
+    
+    async def _upload_listing_file(
+        self,
+        file: UploadFile,
+        listing_id: int,
+        content_type: str,
+        is_primary: bool = False
+    ) -> Tuple[str, str]:
+        """
+        Sube a S3 una imagen de listing ya validada con `_validate_image_file`.
         
+        Args:
+            file: Archivo subido por el usuario.
+            listing_id: ID del listing al que pertenece la imagen.
+            content_type: Tipo MIME detectado al validar el archivo.
+            is_primary: Si es la imagen principal del listing.
+            
+        Returns:
+            Tupla con (key en S3, URL pública de la imagen).
+            
+        Raises:
+            HTTPException 400: Si el archivo excede el tamaño máximo.
+            HTTPException 500: Si falla el upload.
+        """
         # Leer contenido del archivo
         contents = await file.read()
         file_size = len(contents)
@@ -141,13 +268,11 @@ class S3Service:
         
         try:
             # Upload a S3
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=s3_key,
-                Body=BytesIO(contents),
-                ContentType=file.content_type,
-                CacheControl='max-age=31536000',  # 1 año
-                Metadata={
+            await self._upload_bytes(
+                contents,
+                s3_key,
+                content_type,
+                metadata={
                     'listing_id': str(listing_id),
                     'is_primary': str(is_primary)
                 }
@@ -157,15 +282,68 @@ class S3Service:
             file_url = f"https://{self.bucket_name}.s3.{settings.AWS_REGION}.amazonaws.com/{s3_key}"
             
             logger.info(f"Imagen subida exitosamente: {s3_key}")
-            return file_url
+            return s3_key, file_url
             
-        except (ClientError, BotoCoreError) as e:
+        except (ClientError, BotoCoreError, S3UploadFailedError) as e:
             logger.error(f"Error subiendo imagen a S3: {e}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error subiendo imagen: {str(e)}"
             )
     
+    async def upload_listing_images(
+        self,
+        files: List[UploadFile],
+        listing_id: int
+    ) -> List[str]:
+        """
+        Sube varias imágenes de un listing a S3 de forma concurrente.
+        
+        Los uploads se lanzan en paralelo (como máximo
+        `max_concurrent_uploads` a la vez), por lo que el tiempo total es
+        cercano al del upload más lento en lugar de la suma de todos.
+        
+        Args:
+            files: Archivos subidos por el usuario.
+            listing_id: ID del listing al que pertenecen las imágenes.
+            
+        Returns:
+            URLs públicas de las imágenes, en el mismo orden que `files`.
+            
+        Raises:
+            HTTPException 400: Si algún archivo es inválido (se valida antes
+                de subir ninguno).
+            HTTPException 500: Si falla algún upload.
+            
+        Note:
+            Si algún upload falla, las imágenes que sí se subieron se
+            eliminan de S3 antes de propagar el error.
+        """
+        # Validar todos los archivos antes de subir cualquiera (una sola
+        # lectura de cabecera por archivo; el tipo detectado se reutiliza)
+        content_types = [await self._validate_image_file(file) for file in files]
+        
+        semaphore = asyncio.Semaphore(self.max_concurrent_uploads)
+        
+        async def upload(file: UploadFile, content_type: str) -> Tuple[str, str]:
+            async with semaphore:
+                return await self._upload_listing_file(file, listing_id, content_type)
+        
+        results = await asyncio.gather(
+            *(upload(file, content_type) for file, content_type in zip(files, content_types)),
+            return_exceptions=True
+        )
+        
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            await asyncio.gather(*(
+                self.delete_image(r[0]) for r in results if isinstance(r, tuple)
+            ))
+            raise errors[0]
+        
+        logger.info(f"{len(results)} imágenes subidas para listing {listing_id}")
+        return [file_url for _, file_url in results]
+    
     async def upload_profile_image(
         self,
         file: UploadFile,
@@ -194,12 +372,8 @@ class S3Service:
             # file_url = "https://s3.amazonaws.com/bucket/images/profiles/user_id/uuid.jpg"
             ```
         """
-        # Validar tipo de archivo
-        if file.content_type not in self.allowed_types:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Tipo de archivo no permitido. Usa: {', '.join(self.allowed_types)}"
-            )
+        # Validar tipo de archivo (declarado y por contenido)
+        content_type = await self._validate_image_file(file)
         
         # Leer contenido del archivo
         contents = await file.read()
@@ -221,13 +395,11 @@ class S3Service:
         
         try:
             # Upload a S3
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=s3_key,
-                Body=BytesIO(contents),
-                ContentType=file.content_type,
-                CacheControl='max-age=31536000',  # 1 año
-                Metadata={
+            await self._upload_bytes(
+                contents,
+                s3_key,
+                content_type,
+                metadata={
                     'user_id': str(user_id),
                     'type': 'profile_image'
                 }
@@ -239,7 +411,7 @@ class S3Service:
             logger.info(f"Imagen de perfil subida exitosamente: {s3_key}")
             return file_url
             
-        except (ClientError, BotoCoreError) as e:
+        except (ClientError, BotoCoreError, S3UploadFailedError) as e:
             logger.error(f"Error subiendo imagen de perfil a S3: {e}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -264,7 +436,9 @@ class S3Service:
             ```
         """
         try:
-            self.s3_client.delete_object(
+            # boto3 es bloqueante: el delete corre en el thread pool
+            await asyncio.to_thread(
+                self.s3_client.delete_object,
                 Bucket=self.bucket_name,
                 Key=s3_key
             )
@@ -274,6 +448,71 @@ class S3Service:
             logger.error(f"Error eliminando imagen de S3: {e}")
             return False
     
+    def generate_presigned_listing_upload(
+        self,
+        listing_id: int,
+        content_type: str,
+        expiration: int = 900
+    ) -> Dict:
+        """
+        Genera un POST presignado para que el cliente suba una imagen de
+        listing directamente a S3, sin pasar los bytes por la API.
+        
+        La política firmada fija la key, el Content-Type y el tamaño máximo
+        (`max_file_size`), por lo que S3 rechaza archivos que no cumplan.
+        
+        Args:
+            listing_id: ID del listing al que pertenecerá la imagen.
+            content_type: Tipo MIME de la imagen a subir.
+            expiration: Tiempo de validez en segundos (default: 15 minutos).
+            
+        Returns:
+            Diccionario con `upload_url`, `fields` (campos del formulario a
+            enviar junto al archivo), `s3_key` e `image_url` (URL pública
+            final de la imagen).
+            
+        Raises:
+            HTTPException 400: Si el tipo de archivo no está permitido.
+            HTTPException 500: Si falla la generación.
+        """
+        if content_type not in self.allowed_types:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Tipo de archivo no permitido. Usa: {', '.join(self.allowed_types)}"
+            )
+        
+        file_extension = content_type.split("/")[-1]
+        s3_key = f"{self.images_prefix}listings/{listing_id}/{uuid.uuid4()}.{file_extension}"
+        
+        try:
+            presigned = self.s3_client.generate_presigned_post(
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                Fields={
+                    'Content-Type': content_type,
+                    'Cache-Control': 'max-age=31536000',
+                },
+                Conditions=[
+                    {'Content-Type': content_type},
+                    {'Cache-Control': 'max-age=31536000'},
+                    ['content-length-range', 1, self.max_file_size],
+                ],
+                ExpiresIn=expiration
+            )
+        except (ClientError, BotoCoreError) as e:
+            logger.error(f"Error generando upload presignado: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error generando URL de subida: {str(e)}"
+            )
+        
+        return {
+            "upload_url": presigned["url"],
+            "fields": presigned["fields"],
+            "s3_key": s3_key,
+            "image_url": f"https://{self.bucket_name}.s3.{settings.AWS_REGION}.amazonaws.com/{s3_key}",
+        }
+    
     def generate_presigned_url(
         self,
         s3_key: str,
@@ -18,9 +18,15 @@ from fastapi import HTTPException, status
 
 from app.models.category import Category, ListingTypeEnum
 from app.schemas.category import CategoryCreate, CategoryUpdate
+from app.utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Tipo (MATERIAL/PRODUCT) por category_id. Las categorías cambian poco, así
+# que validar un listing no necesita consultarlas en cada creación.
+# Se invalida en update_category y delete_category.
+category_type_cache = TTLCache(maxsize=1024, ttl=300)
+
 
 def generate_slug(name: str) -> str:
     """
@@ -376,6 +382,7 @@ async def update_category(
     try:
         await db.commit()
         await db.refresh(category)
+        category_type_cache.pop(category_id)
         logger.info(f"Categoría {category_id} actualizada exitosamente")
         return category
     except Exception as e:
@@ -438,6 +445,7 @@ async def delete_category(db: AsyncSession, category_id: int) -> None:
     try:
         await db.delete(category)
         await db.commit()
+        category_type_cache.pop(category_id)
         logger.info(f"Categoría {category_id} eliminada exitosamente")
     except Exception as e:
         await db.rollback()
@@ -8,13 +8,13 @@ Este servicio está completamente asíncrono para aprovechar la arquitectura
 de FastAPI y SQLAlchemy 2.0 async, mejorando el rendimiento y escalabilidad.
 """
 import logging
-from typing import List, Optional, Tuple
+from typing import Hashable, List, Optional, Tuple
 from decimal import Decimal
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, insert, update, and_, func, tuple_, bindparam, Select
+from sqlalchemy.orm import selectinload, joinedload, raiseload, defer, with_expression
 from fastapi import UploadFile, HTTPException, status
 
 from app.models.listing import Listing, ListingStatusEnum
@@ -24,9 +24,92 @@ from app.models.user import User, UserStatusEnum
 from app.schemas.listing import (
     ListingCreate, ListingUpdate, ListingStatusUpdate
 )
-from app.services.aws_s3_service import S3Service
+from app.services.aws_s3_service import s3_service
+from app.services.category_service import category_type_cache
+from app.core.config import get_settings
+from app.utils.cache import TTLCache
+from app.utils.pagination import encode_cursor, decode_cursor
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Con DB_RAISELOAD, cualquier relación no cargada explícitamente lanza error
+# en lugar de disparar una consulta lazy (detecta N+1 en desarrollo/tests)
+_RAISELOAD_OPTIONS = (raiseload("*"),) if settings.DB_RAISELOAD else ()
+
+# Los listados solo arman tarjetas (ListingCardRead): no se traen las
+# columnas TEXT largas que únicamente usa la vista de detalle
+_CARD_DEFER_OPTIONS = (
+    defer(Listing.description, raiseload=settings.DB_RAISELOAD),
+    defer(Listing.origin_description, raiseload=settings.DB_RAISELOAD),
+)
+
+# URL de la imagen principal (o la primera si ninguna está marcada) como
+# subconsulta correlacionada; cubre el índice parcial de imagen primaria
+_PRIMARY_IMAGE_URL = (
+    select(ListingImage.image_url)
+    .where(ListingImage.listing_id == Listing.listing_id)
+    .order_by(ListingImage.is_primary.desc(), ListingImage.image_id)
+    .limit(1)
+    .correlate(Listing)
+    .scalar_subquery()
+)
+
+# Consulta base de los listados (tarjetas). Los Select son inmutables, así
+# que se arma una sola vez y cada request solo le agrega sus filtros
+_CARD_LIST_STMT = select(Listing).options(
+    with_expression(Listing.primary_image_url, _PRIMARY_IMAGE_URL),
+    joinedload(Listing.category),
+    joinedload(Listing.seller),
+    *_CARD_DEFER_OPTIONS,
+    *_RAISELOAD_OPTIONS
+)
+
+# Consultas de lectura frecuentes, construidas una sola vez con parámetros
+# ligados: cada llamada solo cambia los valores, nunca la sentencia, así que
+# siempre aciertan en la caché de SQL compilado del engine
+_LISTING_DETAIL_STMT = (
+    select(Listing)
+    .options(
+        selectinload(Listing.images),
+        joinedload(Listing.category),
+        joinedload(Listing.seller),
+        *_RAISELOAD_OPTIONS
+    )
+    .where(Listing.listing_id == bindparam("listing_id"))
+)
+_ACTIVE_LISTING_DETAIL_STMT = _LISTING_DETAIL_STMT.where(
+    Listing.status == ListingStatusEnum.ACTIVE
+)
+
+_SELLER_STATUS_STMT = select(User.status).where(User.user_id == bindparam("seller_id"))
+_CATEGORY_TYPE_AND_SELLER_STATUS_STMT = select(
+    select(Category.type)
+    .where(Category.category_id == bindparam("category_id"))
+    .scalar_subquery(),
+    _SELLER_STATUS_STMT.scalar_subquery(),
+)
+
+_LISTING_OWNER_AND_IMAGE_COUNT_STMT = select(
+    Listing.seller_id,
+    select(func.count(ListingImage.image_id))
+    .where(ListingImage.listing_id == Listing.listing_id)
+    .scalar_subquery(),
+).where(Listing.listing_id == bindparam("listing_id"))
+
+# Totales de listados por combinación de filtros (ver `total_key` en cada listado)
+_total_cache = TTLCache(maxsize=1024, ttl=settings.LISTING_TOTAL_CACHE_TTL_SECONDS)
+
+
+def invalidate_listing_totals() -> None:
+    """
+    Descarta los totales de listados cacheados.
+
+    Debe llamarse tras cualquier cambio que altere qué listings cumplen los
+    filtros (alta, baja, cambio de estado o de precio). La caché es por
+    proceso: otros workers pueden mostrar el total anterior hasta su TTL.
+    """
+    _total_cache.clear()
 
 
 async def create_listing(
@@ -48,11 +131,11 @@ async def create_listing(
     Raises:
         HTTPException: Si hay errores de validación.
     """
-    # Validar que la categoría existe y coincide con el tipo
-    await _validate_category(db, listing_data.category_id, listing_data.listing_type)
-
-    # Validar que el usuario existe y está activo
-    await _validate_seller(db, seller_id)
+    # Validar categoría (existe y coincide con el tipo) y vendedor (existe y
+    # está activo) en una sola consulta
+    await _validate_category_and_seller(
+        db, listing_data.category_id, listing_data.listing_type, seller_id
+    )
 
     # Crear el listing
     db_listing = Listing(
@@ -71,26 +154,20 @@ async def create_listing(
 
     db.add(db_listing)
     await db.commit()
-    await db.refresh(db_listing)
+    invalidate_listing_totals()
     
-    # Si se proporcionaron URLs de imágenes, crearlas
-    if listing_data.images and len(listing_data.images) > 0:
-        logger.info(f"Agregando {len(listing_data.images)} imágenes al listing {db_listing.listing_id}")
-        for idx, image_url in enumerate(listing_data.images):
-            db_image = ListingImage(
-                listing_id=db_listing.listing_id,
-                image_url=image_url,
-                is_primary=(idx == 0)  # La primera imagen es la principal
-            )
-            db.add(db_image)
-        
-        await db.commit()
-        logger.info(f"Imágenes agregadas correctamente al listing {db_listing.listing_id}")
+    # Si se proporcionaron URLs de imágenes, crearlas (la primera es la principal)
+    if listing_data.images:
+        await _create_listing_images(db, db_listing.listing_id, listing_data.images, 0)
     
     # Cargar las relaciones explícitamente para evitar lazy loading
     stmt = (
         select(Listing)
-        .options(selectinload(Listing.images))
+        .options(
+            selectinload(Listing.images),
+            joinedload(Listing.seller),
+            *_RAISELOAD_OPTIONS
+        )
         .where(Listing.listing_id == db_listing.listing_id)
     )
     result = await db.execute(stmt)
@@ -117,20 +194,8 @@ async def get_listing_by_id(
     Returns:
         Listing encontrado o None.
     """
-    stmt = (
-        select(Listing)
-        .options(
-            selectinload(Listing.images),
-            selectinload(Listing.category),
-            selectinload(Listing.seller)
-        )
-        .where(Listing.listing_id == listing_id)
-    )
-
-    if not include_inactive:
-        stmt = stmt.where(Listing.status == ListingStatusEnum.ACTIVE)
-
-    result = await db.execute(stmt)
+    stmt = _LISTING_DETAIL_STMT if include_inactive else _ACTIVE_LISTING_DETAIL_STMT
+    result = await db.execute(stmt, {"listing_id": listing_id})
     return result.scalar_one_or_none()
 
 
@@ -142,8 +207,10 @@ async def get_public_listings(
     max_price: Optional[Decimal] = None,
     search_query: Optional[str] = None,
     page: int = 1,
-    page_size: int = 20
-) -> Tuple[List[Listing], int]:
+    page_size: int = 20,
+    cursor: Optional[str] = None,
+    include_total: bool = False
+) -> Tuple[List[Listing], Optional[int], Optional[str]]:
     """
     Obtiene listado público de listings con filtros.
 
@@ -153,57 +220,53 @@ async def get_public_listings(
         category_id: Filtro opcional por categoría.
         min_price: Precio mínimo.
         max_price: Precio máximo.
-        search_query: Búsqueda en título y descripción.
-        page: Número de página.
+        search_query: Búsqueda de texto completo (por palabras) en título
+            y descripción.
+        page: Número de página (se ignora si se envía `cursor`).
         page_size: Tamaño de página.
+        cursor: Cursor de paginación keyset devuelto en la página anterior.
+        include_total: Si True, calcula también el total de registros.
 
     Returns:
-        Tupla con (lista de listings, total de registros).
+        Tupla con (lista de listings, total de registros, cursor siguiente).
+        El total es None si no se pidió con `include_total`.
     """
-    # Query base: solo listings activos
-    stmt = (
-        select(Listing)
-        .options(
-            selectinload(Listing.images),
-            selectinload(Listing.category),
-            selectinload(Listing.seller)
-        )
-        .where(Listing.status == ListingStatusEnum.ACTIVE)
-    )
+    # Solo listings activos + filtros opcionales, aplicados en un único where()
+    criteria = [Listing.status == ListingStatusEnum.ACTIVE]
 
-    # Aplicar filtros
     if listing_type:
-        stmt = stmt.where(Listing.listing_type == listing_type)
+        criteria.append(Listing.listing_type == listing_type)
 
     if category_id:
-        stmt = stmt.where(Listing.category_id == category_id)
+        criteria.append(Listing.category_id == category_id)
 
     if min_price is not None:
-        stmt = stmt.where(Listing.price >= min_price)
+        criteria.append(Listing.price >= min_price)
 
     if max_price is not None:
-        stmt = stmt.where(Listing.price <= max_price)
+        criteria.append(Listing.price <= max_price)
 
     if search_query:
-        search_filter = or_(
-            Listing.title.ilike(f"%{search_query}%"),
-            Listing.description.ilike(f"%{search_query}%")
+        # Búsqueda de texto completo sobre el índice GIN de search_tsv
+        criteria.append(
+            Listing.__table__.c.search_tsv.op("@@")(
+                func.plainto_tsquery("simple", search_query)
+            )
         )
-        stmt = stmt.where(search_filter)
-
-    # Obtener total de registros
-    count_stmt = select(func.count()).select_from(stmt.subquery())
-    total_result = await db.execute(count_stmt)
-    total = total_result.scalar()
 
-    # Aplicar paginación y ordenamiento
-    skip = (page - 1) * page_size
-    stmt = stmt.order_by(Listing.created_at.desc()).offset(skip).limit(page_size)
-
-    result = await db.execute(stmt)
-    listings = result.scalars().all()
+    stmt = _CARD_LIST_STMT.where(*criteria)
+    # Clave del total: los filtros normalizados (la búsqueda con "simple" no
+    # distingue mayúsculas ni espacios repetidos)
+    total_key = (
+        "public",
+        listing_type,
+        category_id or None,
+        min_price,
+        max_price,
+        " ".join(search_query.lower().split()) if search_query else None,
+    )
 
-    return list(listings), total
+    return await _paginate(db, stmt, total_key, page, page_size, cursor, include_total)
 
 
 async def get_seller_listings(
@@ -211,8 +274,10 @@ async def get_seller_listings(
     seller_id: UUID,
     status_filter: Optional[ListingStatusEnum] = None,
     page: int = 1,
-    page_size: int = 20
-) -> Tuple[List[Listing], int]:
+    page_size: int = 20,
+    cursor: Optional[str] = None,
+    include_total: bool = False
+) -> Tuple[List[Listing], Optional[int], Optional[str]]:
     """
     Obtiene listings de un vendedor específico.
 
@@ -220,38 +285,24 @@ async def get_seller_listings(
         db: Sesión asíncrona de base de datos.
         seller_id: UUID del vendedor.
         status_filter: Filtro opcional por estado.
-        page: Número de página.
+        page: Número de página (se ignora si se envía `cursor`).
         page_size: Tamaño de página.
+        cursor: Cursor de paginación keyset devuelto en la página anterior.
+        include_total: Si True, calcula también el total de registros.
 
     Returns:
-        Tupla con (lista de listings, total de registros).
+        Tupla con (lista de listings, total de registros, cursor siguiente).
+        El total es None si no se pidió con `include_total`.
     """
-    stmt = (
-        select(Listing)
-        .options(
-            selectinload(Listing.images),
-            selectinload(Listing.category),
-            selectinload(Listing.seller)
-        )
-        .where(Listing.seller_id == seller_id)
-    )
+    criteria = [Listing.seller_id == seller_id]
 
     if status_filter:
-        stmt = stmt.where(Listing.status == status_filter)
-
-    # Obtener total
-    count_stmt = select(func.count()).select_from(stmt.subquery())
-    total_result = await db.execute(count_stmt)
-    total = total_result.scalar()
+        criteria.append(Listing.status == status_filter)
 
-    # Paginación
-    skip = (page - 1) * page_size
-    stmt = stmt.order_by(Listing.created_at.desc()).offset(skip).limit(page_size)
+    stmt = _CARD_LIST_STMT.where(*criteria)
+    total_key = ("seller", seller_id, status_filter)
 
-    result = await db.execute(stmt)
-    listings = result.scalars().all()
-
-    return list(listings), total
+    return await _paginate(db, stmt, total_key, page, page_size, cursor, include_total)
 
 
 async def update_listing(
@@ -275,7 +326,12 @@ async def update_listing(
     Raises:
         HTTPException: Si el listing no existe o no tiene permisos.
     """
-    db_listing = await get_listing_by_id(db, listing_id, include_inactive=True)
+    # Solo se cargan las relaciones que devuelve ListingRead (sin categoría)
+    db_listing = await db.get(
+        Listing,
+        listing_id,
+        options=(selectinload(Listing.images), joinedload(Listing.seller), *_RAISELOAD_OPTIONS)
+    )
 
     if not db_listing:
         raise HTTPException(
@@ -303,7 +359,7 @@ async def update_listing(
         logger.info(f"Listing {listing_id} movido a PENDING para nueva revisión (estado anterior: {db_listing.status})")
 
     await db.commit()
-    await db.refresh(db_listing)
+    invalidate_listing_totals()
 
     logger.info(f"Listing {listing_id} actualizado por seller {seller_id}")
 
@@ -329,7 +385,8 @@ async def delete_listing(
     Raises:
         HTTPException: Si no existe o no tiene permisos.
     """
-    db_listing = await get_listing_by_id(db, listing_id, include_inactive=True)
+    # Solo se necesitan columnas: sin relaciones (fast path del identity map)
+    db_listing = await db.get(Listing, listing_id)
 
     if not db_listing:
         raise HTTPException(
@@ -345,6 +402,7 @@ async def delete_listing(
 
     db_listing.status = ListingStatusEnum.INACTIVE
     await db.commit()
+    invalidate_listing_totals()
 
     logger.info(f"Listing {listing_id} desactivado por seller {seller_id}")
 
@@ -372,54 +430,42 @@ async def add_images_to_listing(
     Raises:
         HTTPException: Si hay errores de validación.
     """
-    # Validar que el listing existe y pertenece al seller
-    db_listing = await get_listing_by_id(db, listing_id, include_inactive=True)
-
-    if not db_listing:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Listing no encontrado"
-        )
-
-    if db_listing.seller_id != seller_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permiso para agregar imágenes a este listing"
-        )
+    current_images = await _validate_new_images(
+        db, listing_id, seller_id, len(image_urls)
+    )
 
-    # Validar número de imágenes (máximo 10)
-    current_images = len(db_listing.images)
-    if current_images + len(image_urls) > 10:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Máximo 10 imágenes por listing. Ya tienes {current_images}"
-        )
+    return await _create_listing_images(db, listing_id, image_urls, current_images)
 
-    # Crear registros de imágenes
-    created_images = []
 
-    for idx, image_url in enumerate(image_urls):
-        # La primera imagen es la principal si no hay imágenes previas
-        is_primary = (idx == 0) and (current_images == 0)
+async def upload_images_to_listing(
+    db: AsyncSession,
+    listing_id: int,
+    seller_id: UUID,
+    files: List[UploadFile]
+) -> List[ListingImage]:
+    """
+    Sube archivos de imagen a S3 en paralelo y los agrega al listing.
 
-        db_image = ListingImage(
-            listing_id=listing_id,
-            image_url=image_url,
-            is_primary=is_primary
-        )
+    Las validaciones (ownership y máximo de imágenes) se hacen antes de
+    subir nada a S3.
 
-        db.add(db_image)
-        created_images.append(db_image)
+    Args:
+        db: Sesión asíncrona de base de datos.
+        listing_id: ID del listing.
+        seller_id: UUID del vendedor (para validación).
+        files: Archivos de imagen subidos por el usuario.
 
-    await db.commit()
+    Returns:
+        Lista de ListingImage creados.
 
-    # Refrescar las imágenes para obtener sus IDs
-    for img in created_images:
-        await db.refresh(img)
+    Raises:
+        HTTPException: Si hay errores de validación o falla el upload.
+    """
+    current_images = await _validate_new_images(db, listing_id, seller_id, len(files))
 
-    logger.info(f"{len(created_images)} imágenes agregadas al listing {listing_id}")
+    image_urls = await s3_service.upload_listing_images(files=files, listing_id=listing_id)
 
-    return created_images
+    return await _create_listing_images(db, listing_id, image_urls, current_images)
 
 
 async def update_listing_status(
@@ -431,6 +477,10 @@ async def update_listing_status(
     """
     Actualiza el estado de un listing (moderación por admin).
 
+    Se ejecuta como un único UPDATE ... RETURNING, sin leer antes el
+    listing; imágenes y vendedor se cargan con selectinload sobre las filas
+    retornadas, igual que en la vista de detalle.
+
     Args:
         db: Sesión asíncrona de base de datos.
         listing_id: ID del listing.
@@ -438,12 +488,25 @@ async def update_listing_status(
         admin_id: UUID del administrador.
 
     Returns:
-        Listing actualizado.
+        Listing actualizado con imágenes y vendedor (serializable como
+        ListingRead).
 
     Raises:
         HTTPException: Si el listing no existe.
     """
-    db_listing = await get_listing_by_id(db, listing_id, include_inactive=True)
+    stmt = (
+        update(Listing)
+        .where(Listing.listing_id == listing_id)
+        .values(**_status_update_values(status_update, admin_id))
+        .returning(Listing)
+        .options(
+            selectinload(Listing.images),
+            selectinload(Listing.seller),
+            *_RAISELOAD_OPTIONS
+        )
+        .execution_options(populate_existing=True)
+    )
+    db_listing = (await db.scalars(stmt)).one_or_none()
 
     if not db_listing:
         raise HTTPException(
@@ -451,13 +514,8 @@ async def update_listing_status(
             detail="Listing no encontrado"
         )
 
-    db_listing.status = status_update.status
-
-    if status_update.status == ListingStatusEnum.ACTIVE:
-        db_listing.approved_by_admin_id = admin_id
-
     await db.commit()
-    await db.refresh(db_listing)
+    invalidate_listing_totals()
 
     logger.info(
         f"Listing {listing_id} cambió a estado {status_update.status} "
@@ -467,27 +525,25 @@ async def update_listing_status(
     return db_listing
 
 
+def _status_update_values(status_update: ListingStatusUpdate, admin_id: UUID) -> dict:
+    """Columnas a actualizar en un cambio de estado de moderación."""
+    values = {"status": status_update.status}
+    if status_update.status == ListingStatusEnum.ACTIVE:
+        values["approved_by_admin_id"] = admin_id
+    return values
+
+
 def convert_to_card_response(listing: Listing) -> dict:
     """
     Convierte un Listing a formato de tarjeta para respuestas de listado.
 
     Args:
-        listing: Objeto Listing de SQLAlchemy.
+        listing: Objeto Listing cargado por las consultas de listado, con
+            `primary_image_url` ya calculado vía `with_expression`.
 
     Returns:
         Diccionario con formato para ListingCardRead.
     """
-    # Obtener imagen principal
-    primary_image = None
-    if listing.images:
-        for img in listing.images:
-            if img.is_primary:
-                primary_image = str(img.image_url)
-                break
-        # Si no hay imagen marcada como principal, usar la primera
-        if not primary_image:
-            primary_image = str(listing.images[0].image_url)
-
     return {
         "listing_id": listing.listing_id,
         "title": listing.title,
@@ -495,7 +551,7 @@ def convert_to_card_response(listing: Listing) -> dict:
         "price_unit": listing.price_unit,
         "listing_type": listing.listing_type,
         "status": listing.status,
-        "primary_image_url": primary_image,
+        "primary_image_url": listing.primary_image_url,
         "seller_id": listing.seller_id,
         "seller": listing.seller,
         "seller_name": listing.seller.full_name if listing.seller else None,
@@ -505,65 +561,283 @@ def convert_to_card_response(listing: Listing) -> dict:
     }
 
 
-# ========== FUNCIONES PRIVADAS DE VALIDACIÓN ==========
+async def presign_listing_image_uploads(
+    db: AsyncSession,
+    listing_id: int,
+    seller_id: UUID,
+    content_types: List[str]
+) -> List[dict]:
+    """
+    Genera uploads presignados para que el cliente suba imágenes directo a S3.
+
+    Tras subir los archivos, el cliente registra las `image_url` con
+    `add_images_to_listing` (POST /listings/{id}/images).
+
+    Args:
+        db: Sesión asíncrona de base de datos.
+        listing_id: ID del listing.
+        seller_id: UUID del vendedor (para validación).
+        content_types: Tipo MIME de cada imagen a subir.
+
+    Returns:
+        Lista de diccionarios con los datos de cada upload presignado.
 
-async def _validate_category(
+    Raises:
+        HTTPException: Si hay errores de validación.
+    """
+    await _validate_new_images(db, listing_id, seller_id, len(content_types))
+
+    return [
+        s3_service.generate_presigned_listing_upload(listing_id, content_type)
+        for content_type in content_types
+    ]
+
+
+# ========== FUNCIONES PRIVADAS DE PAGINACIÓN ==========
+
+async def _paginate(
     db: AsyncSession,
-    category_id: int,
-    listing_type: ListingTypeEnum
-) -> None:
+    stmt: Select,
+    total_key: Hashable,
+    page: int,
+    page_size: int,
+    cursor: Optional[str],
+    include_total: bool = False
+) -> Tuple[List[Listing], Optional[int], Optional[str]]:
     """
-    Valida que la categoría existe y coincide con el tipo.
+    Pagina una consulta de listings ordenada por (created_at, listing_id) DESC.
+
+    Con `cursor` usa paginación keyset: filtra por la posición del último
+    elemento visto, por lo que el costo no crece con la profundidad. Sin
+    `cursor` usa paginación por página (OFFSET).
+
+    En ambos modos se pide un elemento extra (limit + 1) para saber si hay
+    más resultados y generar `next_cursor`.
 
     Args:
         db: Sesión asíncrona de base de datos.
-        category_id: ID de la categoría.
-        listing_type: Tipo de listing esperado.
+        stmt: Consulta de listings con los filtros ya aplicados.
+        total_key: Clave de `_total_cache` que identifica los filtros de
+            `stmt` (valores normalizados, sin compilar SQL).
+        page: Número de página (modo offset).
+        page_size: Tamaño de página.
+        cursor: Cursor keyset opcional.
+        include_total: Si True, calcula el total de registros que cumplen
+            los filtros (cacheado `LISTING_TOTAL_CACHE_TTL_SECONDS`).
+
+    Returns:
+        Tupla con (listings, total o None, cursor siguiente o None).
 
     Raises:
-        HTTPException: Si la categoría no existe o no coincide el tipo.
+        HTTPException: Si el cursor está mal formado.
+
+    Note:
+        En modo offset el total se obtiene en la misma consulta con
+        `COUNT(*) OVER ()`, sin un COUNT aparte. En modo keyset la ventana
+        solo vería las filas posteriores al cursor, así que ahí (o si la
+        página viene vacía) se usa el COUNT cacheado.
     """
-    result = await db.execute(
-        select(Category).where(Category.category_id == category_id)
-    )
-    category = result.scalar_one_or_none()
+    total = _total_cache.get(total_key) if include_total else None
+    filtered_stmt = stmt
+    use_window = include_total and total is None and not cursor
+
+    if cursor:
+        try:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor de paginación inválido"
+            )
+        stmt = stmt.where(
+            tuple_(Listing.created_at, Listing.listing_id) < (cursor_created_at, cursor_id)
+        )
+    else:
+        stmt = stmt.offset((page - 1) * page_size)
+
+    stmt = stmt.order_by(
+        Listing.created_at.desc(), Listing.listing_id.desc()
+    ).limit(page_size + 1)
+
+    if use_window:
+        stmt = stmt.add_columns(func.count().over().label("total"))
+
+    result = await db.execute(stmt)
+    if use_window:
+        rows = result.all()
+        listings = [row[0] for row in rows]
+        if rows:
+            total = rows[0].total
+            _total_cache.set(total_key, total)
+    else:
+        listings = list(result.scalars().all())
+
+    if include_total and total is None:
+        # El COUNT aparte solo se arma en un fallo de caché
+        count_stmt = select(func.count()).select_from(filtered_stmt.subquery())
+        total = (await db.execute(count_stmt)).scalar()
+        _total_cache.set(total_key, total)
+
+    next_cursor = None
+    if len(listings) > page_size:
+        listings = listings[:page_size]
+        last = listings[-1]
+        next_cursor = encode_cursor(last.created_at, last.listing_id)
+
+    return listings, total, next_cursor
+
+
+# ========== FUNCIONES PRIVADAS DE IMÁGENES ==========
+
+async def _validate_new_images(
+    db: AsyncSession,
+    listing_id: int,
+    seller_id: UUID,
+    new_count: int
+) -> int:
+    """
+    Valida que el seller puede agregar `new_count` imágenes al listing.
+
+    Args:
+        db: Sesión asíncrona de base de datos.
+        listing_id: ID del listing.
+        seller_id: UUID del vendedor (para validación).
+        new_count: Número de imágenes a agregar.
+
+    Returns:
+        Número de imágenes que el listing ya tiene.
+
+    Raises:
+        HTTPException: Si el listing no existe, no es del seller o se
+            excede el máximo de 10 imágenes.
+    """
+    # Dueño del listing y número de imágenes actuales en una sola consulta,
+    # sin cargar el listing ni su colección de imágenes
+    row = (await db.execute(
+        _LISTING_OWNER_AND_IMAGE_COUNT_STMT, {"listing_id": listing_id}
+    )).first()
 
-    if not category:
+    if row is None:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Categoría no encontrada"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Listing no encontrado"
+        )
+
+    listing_seller_id, current_images = row
+
+    if listing_seller_id != seller_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes permiso para agregar imágenes a este listing"
         )
 
-    if category.type != listing_type:
+    # Validar número de imágenes (máximo 10)
+    if current_images + new_count > 10:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"La categoría debe ser de tipo {listing_type.value}"
+            detail=f"Máximo 10 imágenes por listing. Ya tienes {current_images}"
         )
 
+    return current_images
+
+
+async def _create_listing_images(
+    db: AsyncSession,
+    listing_id: int,
+    image_urls: List[str],
+    current_images: int
+) -> List[ListingImage]:
+    """
+    Crea los registros ListingImage de un listing con un único
+    INSERT ... RETURNING (un round-trip sin importar cuántas imágenes sean).
+
+    Args:
+        db: Sesión asíncrona de base de datos.
+        listing_id: ID del listing.
+        image_urls: URLs de las imágenes en S3.
+        current_images: Número de imágenes que el listing ya tiene.
+
+    Returns:
+        Lista de ListingImage creados.
+    """
+    # La primera imagen es la principal si no hay imágenes previas
+    rows = [
+        {
+            "listing_id": listing_id,
+            "image_url": image_url,
+            "is_primary": (idx == 0) and (current_images == 0),
+        }
+        for idx, image_url in enumerate(image_urls)
+    ]
+
+    # RETURNING devuelve las filas completas (IDs incluidos), sin refresh
+    result = await db.scalars(insert(ListingImage).returning(ListingImage), rows)
+    created_images = list(result.all())
+    await db.commit()
+
+    logger.info(f"{len(created_images)} imágenes agregadas al listing {listing_id}")
+
+    return created_images
+
 
-async def _validate_seller(db: AsyncSession, seller_id: UUID) -> None:
+# ========== FUNCIONES PRIVADAS DE VALIDACIÓN ==========
+
+async def _validate_category_and_seller(
+    db: AsyncSession,
+    category_id: int,
+    listing_type: ListingTypeEnum,
+    seller_id: UUID
+) -> None:
     """
-    Valida que el vendedor existe y está activo.
+    Valida la categoría y el vendedor de un listing en un solo round-trip.
+
+    Obtiene el tipo de la categoría y el estado del vendedor como
+    subconsultas escalares de un mismo SELECT (None si no existen). Si el
+    tipo de la categoría ya está en `category_type_cache`, solo se
+    consulta el vendedor.
 
     Args:
         db: Sesión asíncrona de base de datos.
+        category_id: ID de la categoría.
+        listing_type: Tipo de listing esperado.
         seller_id: UUID del vendedor.
 
     Raises:
-        HTTPException: Si el usuario no existe o no está activo.
+        HTTPException: Si la categoría no existe o no coincide el tipo, o si
+            el usuario no existe o no está activo.
     """
-    result = await db.execute(
-        select(User).where(User.user_id == seller_id)
-    )
-    seller = result.scalar_one_or_none()
+    category_type = category_type_cache.get(category_id)
+    if category_type is None:
+        result = await db.execute(
+            _CATEGORY_TYPE_AND_SELLER_STATUS_STMT,
+            {"category_id": category_id, "seller_id": seller_id}
+        )
+        category_type, seller_status = result.one()
+        if category_type is not None:
+            category_type_cache.set(category_id, category_type)
+    else:
+        result = await db.execute(_SELLER_STATUS_STMT, {"seller_id": seller_id})
+        seller_status = result.scalar_one_or_none()
+
+    if category_type is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Categoría no encontrada"
+        )
+
+    if category_type != listing_type:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"La categoría debe ser de tipo {listing_type.value}"
+        )
 
-    if not seller:
+    if seller_status is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Usuario no encontrado"
         )
 
-    if seller.status != UserStatusEnum.ACTIVE:
+    if seller_status != UserStatusEnum.ACTIVE:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Tu cuenta debe estar activa para crear listings"
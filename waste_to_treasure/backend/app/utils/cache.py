@@ -0,0 +1,96 @@
+"""
+Caché en memoria con expiración por entrada y desalojo LRU.
+
+Se usa para memoizar resultados costosos y de corta vida dentro del
+proceso (p. ej. payloads de JWT ya verificados). Cada worker de
+uvicorn/gunicorn mantiene su propia instancia.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Caché LRU acotada donde cada entrada expira tras un TTL.
+
+    Es thread-safe: todas las operaciones se serializan con un lock,
+    por lo que puede compartirse entre el event loop y el thread pool.
+
+    Attributes:
+        maxsize: Número máximo de entradas antes de desalojar la menos usada.
+        ttl: Tiempo de vida por defecto de cada entrada, en segundos.
+
+    Example:
+        ```python
+        cache = TTLCache(maxsize=1000, ttl=30)
+        cache.set("key", value)
+        cache.get("key")  # value (o None si expiró)
+        ```
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Retorna el valor asociado a `key` si existe y no ha expirado.
+
+        Args:
+            key: Clave a buscar.
+            default: Valor a retornar si no hay entrada válida.
+
+        Returns:
+            Valor almacenado o `default`.
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            value, expires_at = item
+            if expires_at <= time.time():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        expires_at: Optional[float] = None
+    ) -> None:
+        """
+        Inserta o reemplaza una entrada.
+
+        Args:
+            key: Clave de la entrada.
+            value: Valor a almacenar.
+            expires_at: Timestamp (epoch) de expiración. Por defecto
+                `time.time() + ttl`; nunca se extiende más allá del TTL.
+        """
+        limit = time.time() + self.ttl
+        expires_at = limit if expires_at is None else min(expires_at, limit)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Elimina una entrada y retorna su valor (o `default`)."""
+        with self._lock:
+            item = self._data.pop(key, None)
+        return default if item is None else item[0]
+
+    def clear(self) -> None:
+        """Elimina todas las entradas."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
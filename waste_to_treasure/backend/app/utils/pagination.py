@@ -0,0 +1,45 @@
+"""
+Utilidades de paginación keyset (por cursor).
+
+El cursor codifica la posición del último elemento devuelto
+(`created_at`, id) en base64 url-safe, de modo que la siguiente página
+se obtiene con un filtro indexado en lugar de un OFFSET.
+"""
+import base64
+from datetime import datetime
+from typing import Tuple
+
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    """
+    Codifica la posición de un elemento como cursor opaco.
+
+    Args:
+        created_at: Timestamp de creación del último elemento de la página.
+        item_id: ID del último elemento (desempate entre timestamps iguales).
+
+    Returns:
+        Cursor en base64 url-safe.
+    """
+    raw = f"{created_at.isoformat()}|{item_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decodifica un cursor generado por `encode_cursor`.
+
+    Args:
+        cursor: Cursor recibido del cliente.
+
+    Returns:
+        Tupla (created_at, item_id).
+
+    Raises:
+        ValueError: Si el cursor está mal formado.
+    """
+    try:
+        created_at, item_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(item_id)
+    except ValueError as e:
+        raise ValueError(f"Cursor inválido: {cursor}") from e
@@ -22,6 +22,9 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sess
 from uuid import uuid4
 import os
 
+# En tests, cualquier lazy load no previsto en consultas con raiseload falla
+os.environ.setdefault("DB_RAISELOAD", "true")
+
 
 @pytest.fixture(scope="session")
 def db_url():
@@ -36,6 +39,19 @@ def db_url():
     return str(settings.DATABASE_URL)
 
 
+# Tablas que se vacían antes de cada test (CASCADE alcanza a las dependientes)
+_TRUNCATE_TABLES = (
+    "order_items",
+    "orders",
+    "listing_images",
+    "listings",
+    "reviews",
+    "addresses",
+    "users",
+    "categories",
+)
+
+
 @pytest_asyncio.fixture(scope="function")
 async def cleanup_database(db_url):
     """
@@ -49,15 +65,8 @@ async def cleanup_database(db_url):
     engine = create_async_engine(async_url, echo=False)
     
     async with engine.begin() as conn:
-        # Limpiar todas las tablas en orden inverso de dependencias
-        await conn.execute(text("TRUNCATE TABLE order_items CASCADE"))
-        await conn.execute(text("TRUNCATE TABLE orders CASCADE"))
-        await conn.execute(text("TRUNCATE TABLE listing_images CASCADE"))
-        await conn.execute(text("TRUNCATE TABLE listings CASCADE"))
-        await conn.execute(text("TRUNCATE TABLE reviews CASCADE"))
-        await conn.execute(text("TRUNCATE TABLE addresses CASCADE"))
-        await conn.execute(text("TRUNCATE TABLE users CASCADE"))
-        await conn.execute(text("TRUNCATE TABLE categories CASCADE"))
+        # Un solo TRUNCATE para todas las tablas (un round-trip y un lock)
+        await conn.execute(text(f"TRUNCATE TABLE {', '.join(_TRUNCATE_TABLES)} CASCADE"))
     
     await engine.dispose()
     
@@ -132,7 +141,7 @@ def auth_headers_admin(mock_cognito_token_payload):
     """
     import asyncio
     from app.models.user import User, UserRoleEnum, UserStatusEnum
-    from app.core.database import async_session_maker
+    from app.core.database import async_session_maker, async_engine
     
     # UUID y email únicos para admin
     admin_uuid = uuid4()
@@ -150,6 +159,8 @@ def auth_headers_admin(mock_cognito_token_payload):
             )
             session.add(admin)
             await session.commit()
+        # Las conexiones del pool quedan ligadas a este event loop: cerrarlas aquí
+        await async_engine.dispose()
     
     # Ejecutar creación
     asyncio.get_event_loop().run_until_complete(create_admin())
@@ -180,7 +191,14 @@ async def client(cleanup_database):
     """
     from httpx import AsyncClient, ASGITransport
     from app.main import app
+    from app.core.database import async_engine
+    
+    # pytest-asyncio usa un event loop por test y las conexiones asyncpg del
+    # pool no pueden cruzar loops: cada test arranca con un pool vacío
+    await async_engine.dispose(close=False)
     
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
+    
+    await async_engine.dispose()
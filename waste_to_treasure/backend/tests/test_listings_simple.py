@@ -0,0 +1,354 @@
+"""
+Tests simplificados para el listado de publicaciones (/api/v1/listings).
+
+Estos tests verifican:
+- Paginación por página (OFFSET) con total calculado por ventana
+- Paginación keyset con `next_cursor`
+- Búsqueda de texto completo (`search`)
+- Caché de totales (`_total_cache`): acierto, expiración e invalidación
+
+IMPORTANTE:
+- Cada test limpia la BD automáticamente (fixture cleanup_database)
+- Los datos se insertan directamente con una sesión async
+"""
+
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from app.models.category import Category, ListingTypeEnum
+from app.models.listing import Listing, ListingStatusEnum
+from app.models.user import User, UserRoleEnum, UserStatusEnum
+from app.services import listing_service
+from app.utils import cache as cache_module
+
+
+@pytest.fixture(autouse=True)
+def clear_total_cache():
+    """Cada test empieza sin totales cacheados de tests anteriores."""
+    listing_service._total_cache.clear()
+    yield
+    listing_service._total_cache.clear()
+
+
+async def create_listings(count, seller_id=None, category_id=None):
+    """Inserta `count` listings ACTIVE (y su vendedor/categoría si no se dan)."""
+    from app.core.database import async_session_maker
+
+    async with async_session_maker() as session:
+        if seller_id is None:
+            seller_id = uuid4()
+            session.add(User(
+                user_id=seller_id,
+                email=f"seller_{seller_id.hex[:8]}@example.com",
+                full_name="Seller",
+                role=UserRoleEnum.USER,
+                status=UserStatusEnum.ACTIVE
+            ))
+        if category_id is None:
+            category = Category(
+                name=f"Category {uuid4().hex[:6]}",
+                slug=f"category-{uuid4().hex[:6]}",
+                type=ListingTypeEnum.MATERIAL
+            )
+            session.add(category)
+            await session.flush()
+            category_id = category.category_id
+        session.add_all([
+            Listing(
+                seller_id=seller_id,
+                category_id=category_id,
+                listing_type=ListingTypeEnum.MATERIAL,
+                title=f"Recycled material {i}",
+                description="Material reciclado de prueba, listo para reutilizarse en nuevos productos.",
+                price=10,
+                quantity=1,
+                status=ListingStatusEnum.ACTIVE
+            )
+            for i in range(count)
+        ])
+        await session.commit()
+    return seller_id, category_id
+
+
+# ==========================================
+# TESTS: Paginación
+# ==========================================
+
+@pytest.mark.asyncio
+async def test_offset_pagination_returns_window_total(client):
+    """
+    Test: La paginación por página trae el total en la misma consulta.
+    """
+    await create_listings(5)
+
+    response = await client.get("/api/v1/listings", params={"page_size": 2})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 5
+    assert len(data["items"]) == 2
+    assert data["next_cursor"] is not None
+
+    # Última página: sin cursor siguiente
+    data = (await client.get(
+        "/api/v1/listings", params={"page": 3, "page_size": 2}
+    )).json()
+    assert data["total"] == 5
+    assert len(data["items"]) == 1
+    assert data["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_cursor_pagination_walks_all_listings(client):
+    """
+    Test: Siguiendo `next_cursor` se recorren todos los listings sin repetir.
+    """
+    await create_listings(5)
+
+    data = (await client.get("/api/v1/listings", params={"page_size": 2})).json()
+    listing_ids = [item["listing_id"] for item in data["items"]]
+    while data["next_cursor"]:
+        data = (await client.get(
+            "/api/v1/listings",
+            params={"page_size": 2, "cursor": data["next_cursor"]}
+        )).json()
+        # Con cursor el total no se calcula por defecto
+        assert data["total"] is None
+        listing_ids += [item["listing_id"] for item in data["items"]]
+
+    assert len(listing_ids) == 5
+    assert len(set(listing_ids)) == 5
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_returns_400(client):
+    """
+    Test: Un cursor mal formado responde 400.
+    """
+    response = await client.get("/api/v1/listings", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_total_falls_back_to_count(client):
+    """
+    Test: Con cursor o con una página vacía el total sale del COUNT aparte.
+    """
+    await create_listings(5)
+
+    first = (await client.get("/api/v1/listings", params={"page_size": 2})).json()
+    listing_service._total_cache.clear()
+
+    data = (await client.get(
+        "/api/v1/listings",
+        params={"page_size": 2, "cursor": first["next_cursor"], "include_total": True}
+    )).json()
+    assert data["total"] == 5
+
+    listing_service._total_cache.clear()
+    data = (await client.get(
+        "/api/v1/listings", params={"page": 10, "page_size": 2}
+    )).json()
+    assert data["items"] == []
+    assert data["total"] == 5
+
+
+@pytest.mark.asyncio
+async def test_search_matches_title_words(client):
+    """
+    Test: `search` filtra por palabras del título (columna search_tsv).
+    """
+    await create_listings(3)
+
+    data = (await client.get(
+        "/api/v1/listings", params={"search": "MATERIAL 1"}
+    )).json()
+    assert data["total"] == 1
+    assert data["items"][0]["title"] == "Recycled material 1"
+
+    data = (await client.get(
+        "/api/v1/listings", params={"search": "plastico"}
+    )).json()
+    assert data["total"] == 0
+
+
+# ==========================================
+# TESTS: Caché de totales
+# ==========================================
+
+@pytest.fixture
+def listing_queries():
+    """Registra el SQL de cada SELECT sobre listings ejecutado por la app."""
+    from sqlalchemy import event
+    from app.core.database import async_engine
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        if "FROM listings" in statement:
+            statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+def counted(statements):
+    """True si alguna consulta calculó el total (ventana o COUNT aparte)."""
+    return any("count(*)" in statement.lower() for statement in statements)
+
+
+@pytest.mark.asyncio
+async def test_total_cache_hit_and_expiry(client, listing_queries, monkeypatch):
+    """
+    Test: El total se sirve desde caché hasta que expira el TTL.
+
+    Verifica que:
+    1. La segunda petición con los mismos filtros no vuelve a contar
+    2. Otra combinación de filtros tiene su propia entrada
+    3. Al expirar la entrada se vuelve a contar
+    """
+    _, category_id = await create_listings(3)
+
+    data = (await client.get("/api/v1/listings")).json()
+    assert data["total"] == 3
+    assert counted(listing_queries)
+
+    # Acierto de caché: mismo total, sin contar
+    listing_queries.clear()
+    data = (await client.get("/api/v1/listings")).json()
+    assert data["total"] == 3
+    assert not counted(listing_queries)
+
+    # Filtros distintos: entrada propia
+    listing_queries.clear()
+    data = (await client.get(
+        "/api/v1/listings", params={"category_id": category_id}
+    )).json()
+    assert data["total"] == 3
+    assert counted(listing_queries)
+
+    # Expiración: se adelanta el reloj de la caché más allá del TTL
+    expired_at = time.time() + listing_service._total_cache.ttl + 1
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(time=lambda: expired_at))
+    listing_queries.clear()
+    data = (await client.get("/api/v1/listings")).json()
+    assert data["total"] == 3
+    assert counted(listing_queries)
+
+
+@pytest.mark.asyncio
+async def test_mutations_refresh_cached_totals(client):
+    """
+    Test: Crear, desactivar o moderar un listing se refleja en el total.
+
+    Los totales cacheados del listado público y de "mis publicaciones"
+    se descartan en cada mutación, así el total coincide con los items.
+    """
+    from app.core.database import async_session_maker
+    from app.schemas.listing import ListingCreate, ListingStatusUpdate
+
+    seller_id, category_id = await create_listings(3)
+
+    async def totals(session):
+        public = (await client.get("/api/v1/listings")).json()["total"]
+        _, seller_total, _ = await listing_service.get_seller_listings(
+            session, seller_id, include_total=True
+        )
+        return public, seller_total
+
+    async with async_session_maker() as session:
+        admin_id = uuid4()
+        session.add(User(
+            user_id=admin_id,
+            email=f"admin_{admin_id.hex[:8]}@example.com",
+            full_name="Admin User",
+            role=UserRoleEnum.ADMIN,
+            status=UserStatusEnum.ACTIVE
+        ))
+        await session.commit()
+
+        assert await totals(session) == (3, 3)
+
+        # Alta: queda PENDING (solo cambia el total del vendedor)
+        created = await listing_service.create_listing(
+            session,
+            ListingCreate(
+                title="Recycled material new",
+                description="Material reciclado de prueba, listo para reutilizarse en nuevos productos.",
+                price=10,
+                quantity=1,
+                category_id=category_id,
+                listing_type=ListingTypeEnum.MATERIAL
+            ),
+            seller_id
+        )
+        assert await totals(session) == (3, 4)
+
+        # Moderación: al aprobarlo aparece en el listado público
+        await listing_service.update_listing_status(
+            session,
+            created.listing_id,
+            ListingStatusUpdate(status=ListingStatusEnum.ACTIVE),
+            admin_id
+        )
+        assert await totals(session) == (4, 4)
+
+        # Baja (soft delete): sale del listado público
+        await listing_service.delete_listing(session, created.listing_id, seller_id)
+        assert await totals(session) == (3, 4)
+
+
+# ==========================================
+# TESTS: Moderación
+# ==========================================
+
+@pytest.mark.asyncio
+async def test_update_listing_status_result_serializes(client):
+    """
+    Test: El listing retornado al moderar se serializa como ListingRead.
+
+    Imágenes y vendedor deben venir cargados: con una sesión async un
+    lazy load fallaría al validar el schema.
+    """
+    from app.core.database import async_session_maker
+    from app.models.listing_image import ListingImage
+    from app.schemas.listing import ListingRead, ListingStatusUpdate
+
+    seller_id, _ = await create_listings(1)
+    admin_id = uuid4()
+
+    async with async_session_maker() as session:
+        session.add(User(
+            user_id=admin_id,
+            email=f"admin_{admin_id.hex[:8]}@example.com",
+            full_name="Admin User",
+            role=UserRoleEnum.ADMIN,
+            status=UserStatusEnum.ACTIVE
+        ))
+        listing = (await session.scalars(
+            select(Listing).where(Listing.seller_id == seller_id)
+        )).one()
+        session.add(ListingImage(
+            listing_id=listing.listing_id,
+            image_url="https://example.com/image.jpg",
+            is_primary=True
+        ))
+        await session.commit()
+
+        updated = await listing_service.update_listing_status(
+            session,
+            listing.listing_id,
+            ListingStatusUpdate(status=ListingStatusEnum.REJECTED, rejection_reason="Spam"),
+            admin_id
+        )
+
+        data = ListingRead.model_validate(updated)
+        assert data.status == ListingStatusEnum.REJECTED
+        assert data.seller.user_id == seller_id
+        assert [str(image.image_url) for image in data.images] == [
+            "https://example.com/image.jpg"
+        ]
@@ -4,13 +4,15 @@ Fixtures específicas para tests de modelos.
 Provee fixtures comunes como user, category, etc.
 Estos tests usan sesiones SÍNCRONAS porque testan modelos directamente.
 """
+import os
+
 import pytest
 from uuid import uuid4
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, insert
 from sqlalchemy.orm import sessionmaker
 
 from app.models.user import User, UserRoleEnum, UserStatusEnum
-from app.models.category import Category
+from app.models.category import Category, ListingTypeEnum
 from app.core.config import get_settings
 
 
@@ -18,9 +20,19 @@ from app.core.config import get_settings
 def sync_engine():
     """
     Engine síncrono para tests de modelo.
+    
+    Con `PYTEST_FAST=1` las conexiones usan `synchronous_commit=off`: los
+    commits no esperan el flush del WAL a disco. Se sigue usando PostgreSQL
+    (los modelos dependen de UUID, enums, tsvector e índices parciales).
     """
     settings = get_settings()
-    engine = create_engine(str(settings.DATABASE_URL).replace("+asyncpg", "+psycopg2"))
+    connect_args = {}
+    if os.getenv("PYTEST_FAST") == "1":
+        connect_args["options"] = "-c synchronous_commit=off"
+    engine = create_engine(
+        str(settings.DATABASE_URL).replace("+asyncpg", "+psycopg2"),
+        connect_args=connect_args,
+    )
     yield engine
     engine.dispose()
 
@@ -30,11 +42,18 @@ def db(sync_engine):
     """
     Sesión síncrona de base de datos para tests de modelo.
     
-    Usa transacciones que se revierten automáticamente.
+    Usa transacciones que se revierten automáticamente: la sesión se une a
+    la transacción externa de la conexión con SAVEPOINTs, así cada
+    `db.commit()` de un test solo libera un savepoint (sin COMMIT real) y
+    un `IntegrityError` revierte únicamente hasta el último savepoint.
     """
     connection = sync_engine.connect()
     transaction = connection.begin()
-    Session = sessionmaker(bind=connection)
+    Session = sessionmaker(
+        bind=connection,
+        join_transaction_mode="create_savepoint",
+        expire_on_commit=False,
+    )
     session = Session()
     
     yield session
@@ -61,17 +80,33 @@ def user(db):
     )
     db.add(user)
     db.commit()
-    db.refresh(user)
     return user
 
 
+@pytest.fixture
+def create_users_bulk(db):
+    """
+    Factory que inserta varios usuarios en un solo INSERT ... RETURNING.
+    
+    Recibe una lista de dicts con las columnas de User y retorna los
+    objetos User ya persistidos (en el mismo orden).
+    """
+    def _create_users_bulk(rows: list[dict]) -> list[User]:
+        return list(db.scalars(insert(User).returning(User), rows))
+    
+    return _create_users_bulk
+
+
 @pytest.fixture
 def category(db):
     """
     Fixture que provee una categoría de prueba.
-    """
-    from app.models.category import ListingTypeEnum
     
+    Se mantiene con scope de función a propósito: vive dentro de la
+    transacción revertida de `db`, así los tests pueden modificarla o
+    borrarla, y no choca con el TRUNCATE que hacen los tests de API ni con
+    otros tests que crean "Test Category" por su cuenta.
+    """
     category = Category(
         name="Test Category",
         slug="test-category",
@@ -79,5 +114,4 @@ def category(db):
     )
     db.add(category)
     db.commit()
-    db.refresh(category)
     return category
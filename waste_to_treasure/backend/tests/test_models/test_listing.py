@@ -138,6 +138,30 @@ class TestListingModel:
 
         assert listing.status == ListingStatusEnum.PENDING
 
+    def test_listing_to_dict(self, db, user, category):
+        """Test that to_dict() returns the mapped columns of a persisted listing."""
+        listing = Listing(
+            title="Glass Jars",
+            description="Clean glass jars for reuse",
+            price=Decimal("5.00"),
+            seller_id=user.user_id,
+            category_id=category.category_id,
+            listing_type=ListingTypeEnum.MATERIAL,
+            quantity=10
+        )
+        db.add(listing)
+        db.commit()
+
+        data = listing.to_dict()
+
+        assert data["listing_id"] == listing.listing_id
+        assert data["title"] == "Glass Jars"
+        assert data["seller_id"] == user.user_id
+        assert data["created_at"] is not None
+        # Columna generada solo de tabla: no forma parte del dict
+        assert "search_tsv" not in data
+        assert "Glass Jars" in repr(listing)
+
     def test_listing_approved_by_admin(self, db, user, category):
         """Test listing approval by admin."""
         admin = User(
@@ -19,6 +19,39 @@ from app.models.offer import Offer, OfferStatusEnum
 from app.models.notification import Notification
 
 
+@pytest.fixture
+def seller(db):
+    """Active seller that owns the listings offers are made on."""
+    seller_uuid = uuid4()
+    seller = User(
+        user_id=seller_uuid,
+        email=f"seller_{seller_uuid.hex[:8]}@example.com",
+        full_name="Seller",
+        status=UserStatusEnum.ACTIVE
+    )
+    db.add(seller)
+    db.flush()
+    return seller
+
+
+@pytest.fixture
+def listing(db, seller, category):
+    """Active MATERIAL listing (price 50.00, quantity 500) owned by `seller`."""
+    listing = Listing(
+        title="Material",
+        description="Test",
+        price=Decimal("50.00"),
+        seller_id=seller.user_id,
+        category_id=category.category_id,
+        listing_type=ListingTypeEnum.MATERIAL,
+        status=ListingStatusEnum.ACTIVE,
+        quantity=500
+    )
+    db.add(listing)
+    db.flush()
+    return listing
+
+
 # ==================== REPORT TESTS ====================
 @pytest.mark.models
 @pytest.mark.unit
@@ -37,7 +70,7 @@ class TestReportModel:
             quantity=10
         )
         db.add(listing)
-        db.commit()
+        db.flush()
 
         report = Report(
             reporter_user_id=user.user_id,
@@ -63,7 +96,7 @@ class TestReportModel:
             status=UserStatusEnum.ACTIVE
         )
         db.add(reported_user)
-        db.commit()
+        db.flush()
 
         report = Report(
             reporter_user_id=user.user_id,
@@ -92,30 +125,8 @@ class TestReportModel:
 class TestOfferModel:
     """Test Offer model creation and validation."""
 
-    def test_create_offer_basic(self, db, user, category):
+    def test_create_offer_basic(self, db, user, seller, listing):
         """Test creating an offer for a listing."""
-        seller = User(
-            user_id=uuid4(),
-            email="seller@example.com",
-            full_name="Seller",
-            status=UserStatusEnum.ACTIVE
-        )
-        db.add(seller)
-        db.commit()
-
-        listing = Listing(
-            title="Material for Sale",
-            description="Negotiable material",
-            price=Decimal("100.00"),
-            seller_id=seller.user_id,
-            category_id=category.category_id,
-            listing_type=ListingTypeEnum.MATERIAL,
-            status=ListingStatusEnum.ACTIVE,
-            quantity=500
-        )
-        db.add(listing)
-        db.commit()
-
         offer = Offer(
             listing_id=listing.listing_id,
             buyer_id=user.user_id,
@@ -132,30 +143,8 @@ class TestOfferModel:
         assert offer.quantity == 100
         assert offer.status == OfferStatusEnum.PENDING
 
-    def test_offer_with_counter_offer(self, db, user, category):
+    def test_offer_with_counter_offer(self, db, user, seller, listing):
         """Test creating offer with counter offer price."""
-        seller = User(
-            user_id=uuid4(),
-            email="seller2@example.com",
-            full_name="Seller",
-            status=UserStatusEnum.ACTIVE
-        )
-        db.add(seller)
-        db.commit()
-
-        listing = Listing(
-            title="Material",
-            description="Test",
-            price=Decimal("100.00"),
-            seller_id=seller.user_id,
-            category_id=category.category_id,
-            listing_type=ListingTypeEnum.MATERIAL,
-            status=ListingStatusEnum.ACTIVE,
-            quantity=500
-        )
-        db.add(listing)
-        db.commit()
-
         offer = Offer(
             listing_id=listing.listing_id,
             buyer_id=user.user_id,
@@ -171,30 +160,8 @@ class TestOfferModel:
         assert offer.counter_offer_price == Decimal("85.00")
         assert offer.status == OfferStatusEnum.COUNTERED
 
-    def test_offer_calculate_total(self, db, user, category):
+    def test_offer_calculate_total(self, db, user, seller, listing):
         """Test calculate_total method."""
-        seller = User(
-            user_id=uuid4(),
-            email="seller3@example.com",
-            full_name="Seller",
-            status=UserStatusEnum.ACTIVE
-        )
-        db.add(seller)
-        db.commit()
-
-        listing = Listing(
-            title="Material",
-            description="Test",
-            price=Decimal("50.00"),
-            seller_id=seller.user_id,
-            category_id=category.category_id,
-            listing_type=ListingTypeEnum.MATERIAL,
-            status=ListingStatusEnum.ACTIVE,
-            quantity=500
-        )
-        db.add(listing)
-        db.commit()
-
         offer = Offer(
             listing_id=listing.listing_id,
             buyer_id=user.user_id,
@@ -208,30 +175,8 @@ class TestOfferModel:
         # 40.00 * 10 = 400.00
         assert offer.calculate_total() == Decimal("400.00")
 
-    def test_offer_is_expired(self, db, user, category):
+    def test_offer_is_expired(self, db, user, seller, listing):
         """Test is_expired method."""
-        seller = User(
-            user_id=uuid4(),
-            email="seller4@example.com",
-            full_name="Seller",
-            status=UserStatusEnum.ACTIVE
-        )
-        db.add(seller)
-        db.commit()
-
-        listing = Listing(
-            title="Material",
-            description="Test",
-            price=Decimal("50.00"),
-            seller_id=seller.user_id,
-            category_id=category.category_id,
-            listing_type=ListingTypeEnum.MATERIAL,
-            status=ListingStatusEnum.ACTIVE,
-            quantity=500
-        )
-        db.add(listing)
-        db.commit()
-
         # Oferta expirada
         past_time = datetime.now(timezone.utc) - timedelta(days=1)
         offer = Offer(
@@ -247,30 +192,8 @@ class TestOfferModel:
 
         assert offer.is_expired() is True
 
-    def test_offer_can_be_accepted(self, db, user, category):
+    def test_offer_can_be_accepted(self, db, user, seller, listing):
         """Test can_be_accepted method."""
-        seller = User(
-            user_id=uuid4(),
-            email="seller5@example.com",
-            full_name="Seller",
-            status=UserStatusEnum.ACTIVE
-        )
-        db.add(seller)
-        db.commit()
-
-        listing = Listing(
-            title="Material",
-            description="Test",
-            price=Decimal("50.00"),
-            seller_id=seller.user_id,
-            category_id=category.category_id,
-            listing_type=ListingTypeEnum.MATERIAL,
-            status=ListingStatusEnum.ACTIVE,
-            quantity=500
-        )
-        db.add(listing)
-        db.commit()
-
         # Oferta pendiente no expirada
         future_time = datetime.now(timezone.utc) + timedelta(days=7)
         offer = Offer(
@@ -320,7 +243,7 @@ class TestNotificationModel:
             type="SYSTEM"
         )
         db.add(notification)
-        db.commit()
+        db.flush()
 
         notification.mark_as_read()
         db.commit()
@@ -336,7 +259,7 @@ class TestNotificationModel:
             is_read=True
         )
         db.add(notification)
-        db.commit()
+        db.flush()
 
         notification.mark_as_unread()
         db.commit()
@@ -409,30 +332,8 @@ class TestRelatedModelsRelationships:
 
         assert len(user.notifications) >= 2
 
-    def test_offer_relationships(self, db, user, category):
+    def test_offer_relationships(self, db, user, seller, listing):
         """Test offer has correct relationships with buyer, seller, listing."""
-        seller = User(
-            user_id=uuid4(),
-            email="seller@example.com",
-            full_name="Seller",
-            status=UserStatusEnum.ACTIVE
-        )
-        db.add(seller)
-        db.commit()
-
-        listing = Listing(
-            title="Material",
-            description="Test",
-            price=Decimal("100.00"),
-            seller_id=seller.user_id,
-            category_id=category.category_id,
-            listing_type=ListingTypeEnum.MATERIAL,
-            status=ListingStatusEnum.ACTIVE,
-            quantity=500
-        )
-        db.add(listing)
-        db.commit()
-
         offer = Offer(
             listing_id=listing.listing_id,
             buyer_id=user.user_id,
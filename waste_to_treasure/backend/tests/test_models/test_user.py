@@ -16,10 +16,33 @@ Conceptos clave:
 """
 
 import pytest
+from decimal import Decimal
+from itertools import product
+from types import MappingProxyType
 from uuid import uuid4
+from sqlalchemy import select, func, insert
 from sqlalchemy.exc import IntegrityError
 
 from app.models.user import User, UserRoleEnum, UserStatusEnum
+from app.models.listing import Listing, ListingStatusEnum, ListingTypeEnum
+from app.models.order import Order, OrderStatusEnum
+from app.models.cart import Cart
+from app.models.address import Address
+
+
+# Miembros de enums usados en las aserciones, resueltos una sola vez
+_ADMIN, _USER_ROLE = UserRoleEnum.ADMIN, UserRoleEnum.USER
+_PENDING, _ACTIVE, _BLOCKED = UserStatusEnum.PENDING, UserStatusEnum.ACTIVE, UserStatusEnum.BLOCKED
+
+# Kwargs base de User reutilizados por los tests de creación (solo lectura).
+# El email no va aquí: cada test genera uno único
+_BASE_USER = MappingProxyType({"full_name": "Test User"})
+_ADMIN_USER = MappingProxyType(
+    _BASE_USER | {"full_name": "Admin User", "role": _ADMIN, "status": _ACTIVE}
+)
+_ACTIVE_USER = MappingProxyType(
+    _BASE_USER | {"full_name": "Complete User", "role": _USER_ROLE, "status": _ACTIVE}
+)
 
 
 @pytest.mark.models
@@ -27,51 +50,51 @@ from app.models.user import User, UserRoleEnum, UserStatusEnum
 class TestUserModel:
     """Test User model creation and validation."""
 
-    def test_create_user_with_required_fields(self, db):
+    @pytest.mark.parametrize("kwargs,expected", [
+        pytest.param(
+            _BASE_USER,
+            {"role": _USER_ROLE, "status": _PENDING},
+            id="required_fields",
+        ),
+        pytest.param(
+            _ADMIN_USER,
+            {"role": _ADMIN, "status": _ACTIVE},
+            id="admin",
+        ),
+        pytest.param(
+            _ACTIVE_USER,
+            {"role": _USER_ROLE, "status": _ACTIVE},
+            id="all_fields",
+        ),
+    ])
+    def test_create_user(self, db, kwargs, expected):
         """
-        Test creating a user with required fields.
+        Test creating users with different field combinations.
         
         Simula el flujo real:
         1. Usuario se registra en Cognito
         2. Cognito retorna JWT con 'sub' claim (UUID)
         3. Backend crea registro en DB con user_id = sub del token
+        
+        Los campos no enviados deben tomar sus defaults (USER / PENDING).
         """
         user_uuid = uuid4()
-        user = User(
-            user_id=user_uuid,
-            email=f"test_{user_uuid.hex[:8]}@example.com",  # Email único
-            full_name="Test User"
-        )
+        email = f"user-{user_uuid.hex}@example.com"  # Email único
+        user = User(user_id=user_uuid, email=email, **kwargs)
         db.add(user)
         db.commit()
-        db.refresh(user)
 
         assert user.user_id == user_uuid
-        assert user.email == f"test_{user_uuid.hex[:8]}@example.com"
-        assert user.full_name == "Test User"
-        assert user.role == UserRoleEnum.USER  # default value
-        assert user.status == UserStatusEnum.PENDING  # default value
+        assert user.email == email
+        assert user.full_name == kwargs["full_name"]
+        for field, value in expected.items():
+            assert getattr(user, field) == value
+
+    def test_user_timestamps_populated(self, db, user):
+        """Test that created_at and updated_at are set on insert."""
         assert user.created_at is not None
         assert user.updated_at is not None
 
-    def test_create_admin_user(self, db):
-        """Test creating an admin user with explicit role."""
-        admin_uuid = uuid4()
-        admin = User(
-            user_id=admin_uuid,
-            email="admin@example.com",
-            full_name="Admin User",
-            role=UserRoleEnum.ADMIN,
-            status=UserStatusEnum.ACTIVE
-        )
-        db.add(admin)
-        db.commit()
-        db.refresh(admin)
-
-        assert admin.role == UserRoleEnum.ADMIN
-        assert admin.status == UserStatusEnum.ACTIVE
-        assert admin.user_id == admin_uuid
-
     def test_user_email_unique_constraint(self, db, user):
         """Test that duplicate emails are not allowed."""
         duplicate_user = User(
@@ -79,58 +102,25 @@ class TestUserModel:
             email=user.email,  # mismo email (debe fallar)
             full_name="Another User"
         )
-        db.add(duplicate_user)
         
+        # El savepoint absorbe el fallo: la transacción externa sigue usable
         with pytest.raises(IntegrityError):
-            db.commit()
+            with db.begin_nested():
+                db.add(duplicate_user)
+                db.flush()
 
     def test_user_id_unique_constraint(self, db, user):
         """Test that duplicate user_id (cognito sub) are not allowed."""
         duplicate_user = User(
             user_id=user.user_id,  # mismo UUID (debe fallar)
-            email="different@example.com",  # email diferente
+            email=f"different_{uuid4().hex}@example.com",  # email diferente
             full_name="Another User"
         )
-        db.add(duplicate_user)
         
         with pytest.raises(IntegrityError):
-            db.commit()
-
-    def test_user_with_all_fields(self, db):
-        """Test creating a user with all fields populated."""
-        user_uuid = uuid4()
-        user = User(
-            user_id=user_uuid,
-            email="complete@example.com",
-            full_name="Complete User",
-            role=UserRoleEnum.USER,
-            status=UserStatusEnum.ACTIVE
-        )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-
-        assert user.user_id == user_uuid
-        assert user.email == "complete@example.com"
-        assert user.full_name == "Complete User"
-        assert user.role == UserRoleEnum.USER
-        assert user.status == UserStatusEnum.ACTIVE
-
-    def test_user_default_values(self, db):
-        """Test that default values are set correctly."""
-        user_uuid = uuid4()
-        user = User(
-            user_id=user_uuid,
-            email="defaults@example.com",
-            full_name="Default User"
-        )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-
-        # Los defaults deben aplicarse automáticamente
-        assert user.role == UserRoleEnum.USER
-        assert user.status == UserStatusEnum.PENDING
+            with db.begin_nested():
+                db.add(duplicate_user)
+                db.flush()
 
 
 @pytest.mark.models
@@ -139,41 +129,32 @@ class TestUserModel:
 class TestUserRelationships:
     """Test User model relationships with other models."""
 
-    def test_user_can_have_multiple_listings(self, db, user, category):
+    @pytest.mark.parametrize("count", [1, 2, 5])
+    def test_user_can_have_multiple_listings(self, db, user, category, count):
         """Test that a user can have multiple listings as seller."""
-        from app.models.listing import Listing, ListingStatusEnum, ListingTypeEnum
-
-        listing1 = Listing(
-            title="Listing 1",
-            description="Description 1",
-            price=100.0,
-            seller_id=user.user_id,
-            category_id=category.category_id,
-            listing_type=ListingTypeEnum.PRODUCT,
-            status=ListingStatusEnum.ACTIVE
-        )
-        listing2 = Listing(
-            title="Listing 2",
-            description="Description 2",
-            price=200.0,
-            seller_id=user.user_id,
-            category_id=category.category_id,
-            listing_type=ListingTypeEnum.PRODUCT,
-            status=ListingStatusEnum.ACTIVE
-        )
-        db.add_all([listing1, listing2])
+        rows = [
+            {
+                "title": f"Listing {i}",
+                "description": f"Description {i}",
+                "price": 100.0 * i,
+                "seller_id": user.user_id,
+                "category_id": category.category_id,
+                "listing_type": ListingTypeEnum.PRODUCT,
+                "status": ListingStatusEnum.ACTIVE,
+            }
+            for i in range(1, count + 1)
+        ]
+        # INSERT por lotes con Core: sin construir ni rastrear objetos ORM
+        inserted_ids = set(db.scalars(insert(Listing).returning(Listing.listing_id), rows))
         db.commit()
-        db.refresh(user)
 
-        assert len(user.listings) == 2
-        assert listing1 in user.listings
-        assert listing2 in user.listings
+        by_seller = Listing.seller_id == user.user_id
+        assert db.scalar(select(func.count(Listing.listing_id)).where(by_seller)) == count
+        listing_ids = set(db.scalars(select(Listing.listing_id).where(by_seller)))
+        assert listing_ids == inserted_ids
 
     def test_user_can_have_orders(self, db, user):
         """Test that a user can create orders as buyer."""
-        from app.models.order import Order, OrderStatusEnum
-        from decimal import Decimal
-
         order = Order(
             buyer_id=user.user_id,
             order_status=OrderStatusEnum.PAID,
@@ -183,52 +164,63 @@ class TestUserRelationships:
         )
         db.add(order)
         db.commit()
-        db.refresh(user)
 
-        assert len(user.orders) == 1
-        assert user.orders[0].buyer_id == user.user_id
+        with db.no_autoflush:
+            order_ids = db.scalars(select(Order.order_id).where(Order.buyer_id == user.user_id)).all()
+            assert order_ids == [order.order_id]
 
     def test_user_can_have_cart(self, db, user):
         """Test that a user can have a cart (1:1 relationship)."""
-        from app.models.cart import Cart
-
         cart = Cart(user_id=user.user_id)
         db.add(cart)
         db.commit()
-        db.refresh(user)
 
         assert user.cart is not None
         assert user.cart.user_id == user.user_id
 
     def test_user_can_have_addresses(self, db, user):
         """Test that a user can have multiple addresses in their address book."""
-        from app.models.address import Address
-
-        address1 = Address(
-            user_id=user.user_id,
-            street="123 Main St",
-            city="Ciudad de México",
-            state="CDMX",
-            postal_code="01000",
-            country="MX",
-            is_default=True
-        )
-        address2 = Address(
-            user_id=user.user_id,
-            street="456 Other St",
-            city="Guadalajara",
-            state="Jalisco",
-            postal_code="44100",
-            country="MX",
-            is_default=False
-        )
-        db.add_all([address1, address2])
+        rows = [
+            {
+                "user_id": user.user_id,
+                "street": street,
+                "city": city,
+                "state": state,
+                "postal_code": postal_code,
+                "country": "MX",
+                "is_default": (i == 0),
+            }
+            for i, (street, city, state, postal_code) in enumerate([
+                ("123 Main St", "Ciudad de México", "CDMX", "01000"),
+                ("456 Other St", "Guadalajara", "Jalisco", "44100"),
+            ])
+        ]
+        inserted_ids = set(db.scalars(insert(Address).returning(Address.address_id), rows))
         db.commit()
-        db.refresh(user)
 
-        assert len(user.addresses) == 2
-        assert address1 in user.addresses
-        assert address2 in user.addresses
+        by_user = Address.user_id == user.user_id
+        assert db.scalar(select(func.count(Address.address_id)).where(by_user)) == 2
+        address_ids = set(db.scalars(select(Address.address_id).where(by_user)))
+        assert address_ids == inserted_ids
+
+
+@pytest.fixture
+def enum_users(create_users_bulk):
+    """
+    One user per (role, status) combination, inserted in a single
+    INSERT ... RETURNING instead of one add/commit per user.
+    """
+    rows = [
+        {
+            "user_id": uuid4(),
+            "email": f"{role.value.lower()}_{user_status.value.lower()}_{uuid4().hex}@example.com",
+            "full_name": "Enum Test",
+            "role": role,
+            "status": user_status,
+        }
+        for role, user_status in product(UserRoleEnum, UserStatusEnum)
+    ]
+    return create_users_bulk(rows)
 
 
 @pytest.mark.models
@@ -236,44 +228,30 @@ class TestUserRelationships:
 class TestUserEnums:
     """Test User enum values."""
 
-    def test_user_role_enum_values(self):
-        """Test that UserRoleEnum has expected values."""
-        assert UserRoleEnum.USER == "USER"
-        assert UserRoleEnum.ADMIN == "ADMIN"
-
-    def test_user_status_enum_values(self):
-        """Test that UserStatusEnum has expected values."""
-        assert UserStatusEnum.PENDING == "PENDING"
-        assert UserStatusEnum.ACTIVE == "ACTIVE"
-        assert UserStatusEnum.BLOCKED == "BLOCKED"
-
-    def test_user_role_assignment(self, db):
+    @pytest.mark.parametrize("member,value", [
+        (UserRoleEnum.USER, "USER"),
+        (UserRoleEnum.ADMIN, "ADMIN"),
+        (UserStatusEnum.PENDING, "PENDING"),
+        (UserStatusEnum.ACTIVE, "ACTIVE"),
+        (UserStatusEnum.BLOCKED, "BLOCKED"),
+    ])
+    def test_enum_value(self, member, value):
+        """Test that UserRoleEnum and UserStatusEnum have expected values."""
+        assert member == value
+
+    def test_user_role_assignment(self, enum_users):
         """Test assigning different roles to users."""
-        user_uuid = uuid4()
-        user = User(
-            user_id=user_uuid,
-            email="role@example.com",
-            full_name="Role Test",
-            role=UserRoleEnum.ADMIN
-        )
-        db.add(user)
-        db.commit()
+        admins = [user for user in enum_users if user.role == _ADMIN]
 
-        assert user.role == UserRoleEnum.ADMIN
+        assert len(admins) == len(UserStatusEnum)
+        assert {user.role for user in enum_users} == set(UserRoleEnum)
 
-    def test_user_status_assignment(self, db):
+    def test_user_status_assignment(self, enum_users):
         """Test assigning different statuses to users."""
-        user_uuid = uuid4()
-        user = User(
-            user_id=user_uuid,
-            email="status@example.com",
-            full_name="Status Test",
-            status=UserStatusEnum.BLOCKED
-        )
-        db.add(user)
-        db.commit()
+        blocked = [user for user in enum_users if user.status == _BLOCKED]
 
-        assert user.status == UserStatusEnum.BLOCKED
+        assert len(blocked) == len(UserRoleEnum)
+        assert {user.status for user in enum_users} == set(UserStatusEnum)
 
 
 @pytest.mark.models
@@ -281,40 +259,27 @@ class TestUserEnums:
 class TestUserCreation:
     """Test creating users programmatically."""
 
-    def test_create_multiple_users(self, db):
+    @pytest.mark.parametrize("count", [3, 50])
+    def test_create_multiple_users(self, db, create_users_bulk, count):
         """
         Test creating multiple users with unique UUIDs.
         
-        Simula múltiples usuarios registrados en Cognito.
+        Simula múltiples usuarios registrados en Cognito, insertados en
+        un solo INSERT ... RETURNING.
         """
-        user1 = User(
-            user_id=uuid4(),
-            email="user1@example.com",
-            full_name="User One"
-        )
-        user2 = User(
-            user_id=uuid4(),
-            email="user2@example.com",
-            full_name="User Two"
-        )
-        user3 = User(
-            user_id=uuid4(),
-            email="user3@example.com",
-            full_name="User Three"
-        )
-        
-        db.add_all([user1, user2, user3])
-        db.commit()
+        rows = [
+            {"user_id": uuid4(), "email": f"user{i}_{uuid4().hex}@example.com", "full_name": f"User {i}"}
+            for i in range(1, count + 1)
+        ]
+        users = create_users_bulk(rows)
 
-        assert user1.email == "user1@example.com"
-        assert user2.email == "user2@example.com"
-        assert user3.email == "user3@example.com"
-        
-        # Cada usuario debe tener user_id único
-        assert user1.user_id != user2.user_id
-        assert user2.user_id != user3.user_id
-        assert user1.user_id != user3.user_id
+        assert [user.email for user in users] == [row["email"] for row in rows]
+
+        # Cada usuario debe tener user_id único (O(n) con un set, escala con count)
+        user_ids = {user.user_id for user in users}
+        assert len(user_ids) == count
 
         # Verificar que existen en DB
-        users = db.query(User).all()
-        assert len(users) >= 3  # >= porque puede haber usuarios del fixture
+        with db.no_autoflush:
+            stored = db.scalars(select(User.user_id).where(User.user_id.in_(user_ids))).all()
+        assert set(stored) == user_ids
@@ -0,0 +1,107 @@
+"""
+Tests para la verificación de tokens de Cognito (app.core.security).
+
+Estos tests verifican:
+- Caché de payloads verificados (`_verify_cache`): acierto y expiración
+- Rechazo de tokens sin claim 'exp'
+
+IMPORTANTE:
+- No se llama a Cognito: los tokens se firman con una clave RSA local y
+  `_get_signing_key` se reemplaza para devolver su clave pública
+"""
+
+import time
+from types import SimpleNamespace
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+
+from app.core import security
+from app.utils import cache as cache_module
+
+_ISSUER = "https://cognito-idp.us-east-2.amazonaws.com/test-pool"
+_AUDIENCE = "test-client"
+
+
+@pytest.fixture(scope="module")
+def private_key():
+    """Clave RSA local con la que se firman los tokens de prueba."""
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture
+def verify_calls(monkeypatch, private_key):
+    """
+    Configura issuer/audience/clave de prueba y cuenta las verificaciones
+    de firma reales (las que no salen de la caché).
+    """
+    monkeypatch.setattr(security, "_EXPECTED_ISSUER", _ISSUER)
+    monkeypatch.setattr(security, "_AUDIENCE", _AUDIENCE)
+    monkeypatch.setattr(
+        security,
+        "_get_signing_key",
+        lambda kid: SimpleNamespace(key=private_key.public_key())
+    )
+
+    calls = []
+    verify_token_sync = security._verify_token_sync
+
+    def counting_verify(token):
+        calls.append(token)
+        return verify_token_sync(token)
+
+    monkeypatch.setattr(security, "_verify_token_sync", counting_verify)
+    security._verify_cache.clear()
+    yield calls
+    security._verify_cache.clear()
+
+
+def make_token(private_key, **claims):
+    """Firma un token RS256 con claims válidos por defecto."""
+    payload = {
+        "sub": "1498f438-5001-7000-d32f-c970608926ea",
+        "iss": _ISSUER,
+        "aud": _AUDIENCE,
+        "exp": int(time.time()) + 3600,
+        **claims,
+    }
+    payload = {key: value for key, value in payload.items() if value is not None}
+    return jwt.encode(payload, private_key, algorithm="RS256", headers={"kid": "test-kid"})
+
+
+@pytest.mark.asyncio
+async def test_verify_cache_hit_and_expiry(verify_calls, private_key, monkeypatch):
+    """
+    Test: Un token repetido se sirve desde caché hasta que expira la entrada.
+    """
+    token = make_token(private_key)
+
+    payload = await security.verify_cognito_token(token)
+    assert payload["sub"] == "1498f438-5001-7000-d32f-c970608926ea"
+
+    # Acierto de caché: no se vuelve a verificar la firma
+    assert await security.verify_cognito_token(token) == payload
+    assert len(verify_calls) == 1
+
+    # Expiración: se adelanta el reloj de la caché más allá del TTL
+    expired_at = time.time() + security._verify_cache.ttl + 1
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(time=lambda: expired_at))
+    assert await security.verify_cognito_token(token) == payload
+    assert len(verify_calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_token_without_exp_is_rejected(verify_calls, private_key):
+    """
+    Test: Un token bien firmado pero sin 'exp' responde 401 explícito.
+    """
+    token = make_token(private_key, exp=None)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await security.verify_cognito_token(token)
+
+    assert exc_info.value.status_code == 401
+    assert exc_info.value.detail == "Token sin claim requerido: exp"
+    assert len(security._verify_cache) == 0